@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark de backends: JDBC (JayDeBeApi + JPype) x python-oracledb (thin)
+=========================================================================
+
+Compara tempo de inicialização, latência (a primeira execução, fria, à parte) e memória
+dos dois backends executando a consulta da tabela de preços contra um banco Oracle LOCAL de testes (ex.: container
+gvenzl/oracle-free), usando uma tabela substituta com as colunas da VW_FXIN_TAB_COT.
+Cada backend roda em um processo separado para que a memória medida seja só dele. Também
+confere se os dois devolvem os mesmos tipos Python por coluna.
+
+As credenciais vêm do environment/.env (ou variáveis de ambiente) — aponte para o
+banco local, nunca para produção.
+
+Uso:
+    python benchmarks/backend_compare.py --setup --rows 10000   # cria e popula a tabela (requer oracledb)
+    python benchmarks/backend_compare.py --repeat 20
+"""
+
+from decimal import Decimal
+from pathlib import Path
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TABLE = "BENCH_TAB_COT"
+BACKENDS = ("jdbc", "oracledb")
+
+QUERY = f"""
+    SELECT
+        EAN, DESCRICAO, CODPROD, CODFILIAL, ESTOQUE, FAIXA_QTDE,
+        PRECO_LIQ_SUGERIDO, PRECO_FIN_SUGERIDO, DOSAGEM, APRESENTACAO, PRINCIPATIVO, CUSTO_REAL
+    FROM
+        {TABLE}
+    WHERE
+        CODFILIAL = ?
+"""
+
+
+def setup_table(rows):
+    """Cria a tabela substituta e insere `rows` linhas na filial 1"""
+    from environment.config import Config
+    import oracledb
+
+    conn = oracledb.connect(
+        user=Config.ORACLE_USER,
+        password=Config.ORACLE_PASSWORD,
+        dsn=f"{Config.ORACLE_HOST}:{Config.ORACLE_PORT}/{Config.ORACLE_SERVICE}"
+    )
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE {TABLE}")
+    except oracledb.DatabaseError:
+        pass
+    cursor.execute(f"""
+        CREATE TABLE {TABLE} (
+            EAN VARCHAR2(14), DESCRICAO VARCHAR2(120), CODPROD NUMBER(10), CODFILIAL NUMBER(4),
+            ESTOQUE NUMBER(12, 2), FAIXA_QTDE NUMBER(6), PRECO_LIQ_SUGERIDO NUMBER(14, 4),
+            PRECO_FIN_SUGERIDO NUMBER(14, 4), DOSAGEM VARCHAR2(60), APRESENTACAO VARCHAR2(120),
+            PRINCIPATIVO VARCHAR2(200), CUSTO_REAL NUMBER(18, 6)
+        )
+    """)
+    data = [
+        (f"789{i:010d}", f"PRODUTO {i} COMPRIMIDO REVESTIDO", i, 1, i % 500 + 0.5, i % 3 + 1,
+         10 + i % 90 + 0.1234, 12 + i % 90 + 0.5678, f"{i % 50 + 1}MG", "CX 30 COMPRIMIDOS",
+         f"PRINCIPIO ATIVO {i % 700}", Decimal(f"{i}.123456"))
+        for i in range(1, rows + 1)
+    ]
+    cursor.executemany(f"INSERT INTO {TABLE} VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11, :12)", data)
+    conn.commit()
+    conn.close()
+    print(f"Tabela {TABLE} criada com {rows} linhas.")
+
+
+def run_child(backend, repeat):
+    """Mede um backend no processo atual e imprime o resultado em JSON"""
+    os.environ["DB_BACKEND"] = backend
+
+    started = time.perf_counter()
+    from connection.oracle_conn import OracleConnection
+    from connection.statements import Statement
+    db = OracleConnection()
+    db.create_pool()
+    startup = time.perf_counter() - started
+
+    statement = Statement("bench_tab_cot", QUERY, fetch_size=1000)
+    # Primeira execução (fria: parse, metadados, cache de statements vazio) medida à parte
+    begin = time.perf_counter()
+    result = db.execute_query(statement, [1])
+    first = time.perf_counter() - begin
+    types = {column: type(value).__name__ for column, value in (result or [{}])[0].items()}
+
+    timings = []
+    rows = len(result or [])
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = db.execute_query(statement, [1])
+        timings.append(time.perf_counter() - begin)
+        rows = len(result or [])
+
+    timings.sort()
+    print(json.dumps({
+        "backend": backend,
+        "rows": rows,
+        "types": types,
+        "startup_s": round(startup, 3),
+        "first_ms": round(first * 1000, 1),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 1),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 1),
+        # ru_maxrss é em KB no Linux
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--setup", action="store_true", help="cria e popula a tabela substituta")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat)
+        return
+    if args.setup:
+        setup_table(args.rows)
+        return
+
+    print(f"{'backend':<10} {'linhas':>7} {'startup':>9} {'1ª':>9} {'p50':>9} {'p95':>9} {'RSS':>9}")
+    types = {}
+    for backend in BACKENDS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", backend, "--repeat", str(args.repeat)],
+            capture_output=True, text=True
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+        if output.returncode != 0 or not lines:
+            print(f"{backend:<10} falhou: {output.stderr.strip().splitlines()[-1:]}")
+            continue
+        r = json.loads(lines[-1])
+        types[backend] = r["types"]
+        print(f"{r['backend']:<10} {r['rows']:>7} {r['startup_s']:>8}s {r['first_ms']:>7}ms {r['p50_ms']:>7}ms "
+              f"{r['p95_ms']:>7}ms {r['max_rss_mb']:>7}MB")
+
+    if len(types) == len(BACKENDS):
+        jdbc, thin = (types[backend] for backend in BACKENDS)
+        differences = {column: (jdbc.get(column), thin.get(column))
+                       for column in jdbc.keys() | thin.keys() if jdbc.get(column) != thin.get(column)}
+        print(f"tipos diferentes entre os backends: {differences}" if differences else "tipos iguais nos dois backends")
+
+
+if __name__ == "__main__":
+    main()
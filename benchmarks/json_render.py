@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização das respostas JSON
+============================================
+
+Compara, sobre linhas sintéticas no formato da tabela de preços (VW_FXIN_TAB_COT):
+
+- atual:     lista de dicts + jsonable_encoder do FastAPI + json da biblioteca padrão
+- orjson:    lista de dicts serializada direto com orjson (FastJSONResponse)
+- compacto:  {"columns": [...], "rows": [[...]]} com orjson, sem dict por linha
+
+O tempo de "montagem" inclui criar os dicts a partir das tuplas do cursor, que a forma
+compacta dispensa. Não precisa de banco.
+
+Uso:
+    python benchmarks/json_render.py --rows 20000 --repeat 5
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from routes.responses import dumps  # noqa: E402
+
+COLUMNS = [
+    "EAN", "DESCRICAO", "CODPROD", "CODFILIAL", "ESTOQUE", "FAIXA_QTDE", "PRECO_LIQ_SUGERIDO",
+    "PRECO_FIN_SUGERIDO", "DOSAGEM", "APRESENTACAO", "PRINCIPATIVO", "DTULTALTER",
+]
+
+
+def make_rows(count):
+    """Tuplas como as devolvidas pelo cursor, já com tipos Python"""
+    return [
+        (f"789{i:010d}", f"PRODUTO {i} COMPRIMIDO REVESTIDO", i, 1, i % 500 + 0.5, i % 3 + 1,
+         10 + i % 90 + 0.1234, 12 + i % 90 + 0.5678, f"{i % 50 + 1}MG", "CX 30 COMPRIMIDOS",
+         f"PRINCIPIO ATIVO {i % 700}", datetime(2024, 1, 1 + i % 28, 8, 30))
+        for i in range(count)
+    ]
+
+
+def current_path(rows):
+    data = [dict(zip(COLUMNS, row)) for row in rows]
+    content = jsonable_encoder({"user": "bench", "data": data})
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_path(rows):
+    data = [dict(zip(COLUMNS, row)) for row in rows]
+    return dumps({"user": "bench", "data": data})
+
+
+def compact_path(rows):
+    return dumps({"user": "bench", "columns": COLUMNS, "rows": rows})
+
+
+def measure(func, rows, repeat):
+    timings = []
+    payload = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = func(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    paths = [("atual", current_path), ("orjson", orjson_path), ("compacto", compact_path)]
+
+    results = [(name, *measure(func, rows, args.repeat)) for name, func in paths]
+    baseline = results[0][1]
+    print(f"{args.rows} linhas, melhor de {args.repeat}")
+    print(f"{'caminho':<12} {'tempo':>10} {'tamanho':>12} {'speedup':>8}")
+    for name, elapsed, size in results:
+        print(f"{name:<12} {elapsed * 1000:>8.1f}ms {size / 1024:>10.0f}KB {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark do login (/token): bcrypt no event loop x executor x cache de credenciais
+==================================================================================
+
+Simula uma onda de logins simultâneos (início de turno) e, ao mesmo tempo, uma "outra
+rota" que acorda a cada 5 ms. Para cada modo mede a latência dos logins e o atraso dessa
+outra rota, ou seja, quanto tempo o event loop ficou travado:
+
+- bloqueante: authenticate_user (bcrypt direto no event loop, como era)
+- executor:   authenticate_user_async com o cache de credenciais desligado
+- cache:      authenticate_user_async com as credenciais já conferidas uma vez
+
+Não precisa de banco. Usa as credenciais do environment/.env, ou valores de teste.
+
+Uso:
+    python benchmarks/login_bench.py --logins 40
+"""
+
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for name, value in (("SECRET_KEY", "bench"), ("ALGORITHM", "HS256"), ("ACCESS_TOKEN_EXPIRE_MINUTES", "5"),
+                    ("USER_1_USERNAME", "joselucas"), ("USER_1_PASSWORD", "bench-password"),
+                    ("USER_1_FULLNAME", "Bench")):
+    os.environ.setdefault(name, value)
+
+from security import auth  # noqa: E402
+from security.credential_cache import credential_cache  # noqa: E402
+
+USERNAME = "joselucas"
+PROBE_INTERVAL = 0.005
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def blocking_login(password):
+    return auth.authenticate_user(USERNAME, password)
+
+
+async def async_login(password):
+    return await auth.authenticate_user_async(USERNAME, password)
+
+
+async def probe(lags, stop):
+    """Outra rota: dorme PROBE_INTERVAL e registra o quanto acordou atrasada"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def run(mode, login, logins, password):
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    async def timed():
+        started = time.perf_counter()
+        assert await login(password)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(logins)))
+    total = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    print(f"{mode:<11} {logins:>6} {total:>7.2f}s {percentile(latencies, 0.5) * 1000:>8.1f}ms "
+          f"{percentile(latencies, 0.99) * 1000:>8.1f}ms {percentile(lags, 0.99) * 1000:>8.1f}ms "
+          f"{max(lags) * 1000:>8.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    args = parser.parse_args()
+    password = os.environ["USER_1_PASSWORD"]
+
+    print(f"bcrypt: {auth.Config.AUTH_BCRYPT_WORKERS} threads")
+    print(f"{'modo':<11} {'logins':>6} {'total':>8} {'login p50':>10} {'login p99':>10} "
+          f"{'loop p99':>10} {'loop máx':>10}")
+
+    await run("bloqueante", blocking_login, args.logins, password)
+
+    ttl = credential_cache.ttl
+    credential_cache.ttl = 0
+    await run("executor", async_login, args.logins, password)
+    credential_cache.ttl = ttl
+
+    await async_login(password)
+    await run("cache", async_login, args.logins, password)
+    print(f"cache de credenciais: {credential_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Equivalência de sales_by_rca_fornec: consulta original x filtros na CTE + mapa de emitentes
+==========================================================================================
+
+Monta em SQLite (em memória) um esquema substituto com as tabelas usadas pela consulta
+(PCPEDI, PCPEDC, PCPRODUT, PCFORNEC, PCMETA, PCUSUARI, PCEMPR), preenche com dados
+aleatórios — incluindo os emitentes 8888/882/883, matrículas sem CODUSUR, pedidos sem
+emitente, posições/tipos de venda excluídos — e compara, para várias combinações de
+fornecedor, RCA e período, o resultado de SALES_BY_RCA_FORNEC com o de
+SALES_BY_RCA_FORNEC_PUSHDOWN (montada como no Model, com as matrículas do mapa).
+
+As SQL são as do catálogo (models/queries.py); só NVL vira IFNULL para o SQLite. Não
+precisa de Oracle.
+
+Uso:
+    python benchmarks/rca_fornec_equivalence.py --seed 1 --cases 300
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+import argparse
+import random
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import queries  # noqa: E402
+from models.batching import in_list  # noqa: E402
+from models.emitentes import EMITENTES_PROPRIO_RCA, build_reverse_map  # noqa: E402
+
+SCHEMA = """
+    CREATE TABLE PCFORNEC (CODFORNEC INTEGER PRIMARY KEY, FORNECEDOR TEXT);
+    CREATE TABLE PCPRODUT (CODPROD INTEGER PRIMARY KEY, CODFORNEC INTEGER);
+    CREATE TABLE PCUSUARI (CODUSUR INTEGER PRIMARY KEY, CODSUPERVISOR INTEGER);
+    CREATE TABLE PCEMPR (MATRICULA INTEGER PRIMARY KEY, CODUSUR INTEGER);
+    CREATE TABLE PCPEDC (NUMPED INTEGER PRIMARY KEY, CODUSUR INTEGER, CODEMITENTE INTEGER,
+                         CODCLI INTEGER, TIPOVENDA TEXT);
+    CREATE TABLE PCPEDI (NUMPED INTEGER, CODPROD INTEGER, DATA TEXT, POSICAO TEXT, QT REAL,
+                         PVENDA REAL, VLREPASSE REAL);
+    CREATE TABLE PCMETA (DATA TEXT, CODIGO INTEGER, CODUSUR INTEGER, VLVENDAPREV REAL,
+                         TIPOMETA TEXT);
+"""
+
+START = date(2024, 1, 1)
+DAYS = 120
+RCAS = list(range(1, 13))
+FORNECEDORES = list(range(1, 7))
+
+
+def populate(conn, rng):
+    conn.executemany("INSERT INTO PCFORNEC VALUES (?, ?)", [(f, f"FORNECEDOR {f}") for f in FORNECEDORES])
+    conn.executemany("INSERT INTO PCPRODUT VALUES (?, ?)", [(p, rng.choice(FORNECEDORES)) for p in range(1, 81)])
+    conn.executemany("INSERT INTO PCUSUARI VALUES (?, ?)", [(r, 100 + r % 3) for r in RCAS])
+
+    # Matrículas comuns, uma sem CODUSUR e os emitentes especiais também cadastrados na
+    # PCEMPR (com outro CODUSUR, para provar que o CASE não os consulta)
+    empr = [(m, rng.choice(RCAS)) for m in range(1000, 1040)]
+    empr += [(1040, None)] + [(m, rng.choice(RCAS)) for m in EMITENTES_PROPRIO_RCA]
+    conn.executemany("INSERT INTO PCEMPR VALUES (?, ?)", empr)
+    emitentes = [m for m, _ in empr] + list(EMITENTES_PROPRIO_RCA) * 5 + [None, 9999]
+
+    pedidos, itens = [], []
+    for numped in range(1, 2501):
+        pedidos.append((numped, rng.choice(RCAS), rng.choice(emitentes), rng.randint(1, 300),
+                        rng.choice(["1", "1", "1", "5", "7"])))
+        data = (START + timedelta(days=rng.randrange(DAYS))).isoformat()
+        for _ in range(rng.randint(1, 6)):
+            itens.append((numped, rng.randint(1, 80), data, rng.choice(["F", "L", "L", "C", "P"]),
+                          rng.choice([0, 1, 2, 5, 12.5]), round(rng.uniform(1, 90), 2),
+                          round(rng.uniform(0, 5), 2)))
+    conn.executemany("INSERT INTO PCPEDC VALUES (?, ?, ?, ?, ?)", pedidos)
+    conn.executemany("INSERT INTO PCPEDI VALUES (?, ?, ?, ?, ?, ?, ?)", itens)
+
+    metas = []
+    for rca in RCAS:
+        for fornec in FORNECEDORES:
+            for month in (1, 2, 3, 4):
+                if rng.random() < 0.8:
+                    metas.append((date(2024, month, 1).isoformat(), fornec, rca,
+                                  rng.choice([1000.0, 2000.0, 5000.0]), rng.choice(["FR", "FR", "OU"])))
+    conn.executemany("INSERT INTO PCMETA VALUES (?, ?, ?, ?, ?)", metas)
+
+
+def sqlite_sql(sql):
+    return sql.replace("NVL(", "IFNULL(")
+
+
+def run(conn, sql, params):
+    cursor = conn.execute(sqlite_sql(sql), params)
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def normalized(rows):
+    return sorted(
+        tuple(round(value, 6) if isinstance(value, float) else value for value in row.values())
+        for row in rows
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cases", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    populate(conn, rng)
+
+    reverse = build_reverse_map(conn.execute("SELECT MATRICULA, CODUSUR FROM PCEMPR WHERE CODUSUR IS NOT NULL"))
+
+    failures = 0
+    non_empty = 0
+    for _ in range(args.cases):
+        codfornec = rng.choice(FORNECEDORES)
+        codemitente = rng.choice(RCAS + [99])
+        first = START + timedelta(days=rng.randrange(DAYS))
+        last = first + timedelta(days=rng.randrange(-3, DAYS))
+        data1, data2 = first.isoformat(), last.isoformat()
+
+        original = run(conn, queries.SALES_BY_RCA_FORNEC.sql, [data1, data2, codfornec, codemitente])
+
+        placeholders, matriculas = in_list(reverse.get(codemitente, []) or [None])
+        pushdown_sql = queries.SALES_BY_RCA_FORNEC_PUSHDOWN.format(placeholders=placeholders).sql
+        pushdown = run(conn, pushdown_sql,
+                       [data1, data2, codfornec, codemitente, *matriculas, codfornec, codemitente])
+
+        if any(row["VENDALIQ"] for row in original):
+            non_empty += 1
+        if normalized(original) != normalized(pushdown):
+            failures += 1
+            print(f"DIFERENÇA: fornec={codfornec} rca={codemitente} {data1}..{data2}")
+            print(f"  original: {original}")
+            print(f"  pushdown: {pushdown}")
+
+    print(f"{args.cases} casos ({non_empty} com vendas), {failures} diferenças")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
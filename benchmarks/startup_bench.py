@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização do worker
+====================================
+
+Mede, cada vez em um processo novo:
+
+- import:  tempo de `import main` (antes: JVM + bcrypt no import; agora só módulos Python)
+- startup: tempo até o lifespan liberar o servidor para aceitar conexões (/health/live)
+- ready:   tempo até o fim do warm-up (/health/ready = 200), com o tempo de cada etapa
+
+O "ready" depende do banco configurado no environment/.env (aponte para um banco de
+testes). Sem banco, mostra a etapa que falhou.
+
+Uso:
+    python benchmarks/startup_bench.py --repeat 5
+"""
+
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def run_child():
+    import asyncio
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+
+    async def lifespan():
+        async with main.app.router.lifespan_context(main.app):
+            live = time.perf_counter()
+            ready = await main.warm_up.wait()
+            return live, ready, time.perf_counter()
+
+    live, ready, done = asyncio.run(lifespan())
+    print(json.dumps({
+        "import_s": imported - started,
+        "startup_s": live - imported,
+        "ready_s": done - imported,
+        "ready": ready,
+        "warm_up": main.warm_up.stats(),
+    }, default=str))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    results = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True,
+                                cwd=ROOT, env=os.environ)
+        lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+        if output.returncode != 0 or not lines:
+            print(f"falhou: {output.stderr.strip().splitlines()[-1:]}")
+            return
+        results.append(json.loads(lines[-1]))
+
+    for name in ("import_s", "startup_s", "ready_s"):
+        values = [r[name] * 1000 for r in results]
+        print(f"{name[:-2]:<8} mediana {statistics.median(values):>8.1f}ms  máx {max(values):>8.1f}ms")
+    last = results[-1]
+    print(f"pronto: {last['ready']}  etapas: {last['warm_up']['timings']}  erro: {last['warm_up']['error']}")
+
+
+if __name__ == "__main__":
+    main()
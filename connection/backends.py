@@ -0,0 +1,271 @@
+from connection.converters import column_kind, jdbc_column_plan, number_converter, to_decimal
+from decimal import Decimal
+from functools import lru_cache
+from logger.setup_logger import setup_logger, get_logger
+
+setup_logger()
+logger = get_logger(__name__)
+
+"""Backends de acesso ao Oracle. Todos recebem SQL com binds `?` e devolvem linhas como
+tuplas de tipos Python, então o OracleConnection (pool, executor, lotes) não depende do
+driver escolhido em DB_BACKEND."""
+
+# java.sql.Types.VARCHAR, usado no setNull dos binds None
+JDBC_VARCHAR = 12
+
+
+class QueryResult:
+    """Resultado aberto de uma consulta: nomes das colunas, conversores e tipos lógicos
+    (ver converters.column_kind) por coluna e leitura em lotes. Deve ser fechado com close()."""
+
+    def __init__(self, columns, converters, kinds, fetch, close):
+        self.columns = columns
+        self.converters = converters
+        self.kinds = kinds
+        self.fetch = fetch
+        self.close = close
+
+
+class DatabaseBackend:
+    """Interface dos backends"""
+
+    name = None
+
+    def start(self):
+        """Inicialização única do processo (ex.: JVM)"""
+
+    def attach_thread(self):
+        """Chamado em cada thread do executor antes da primeira consulta"""
+
+    def connect(self):
+        raise NotImplementedError
+
+    def validate(self, conn):
+        raise NotImplementedError
+
+    def close(self, conn):
+        conn.close()
+
+    def execute(self, conn, statement, params, fetch_size=None):
+        """Executa o Statement e retorna um QueryResult"""
+        raise NotImplementedError
+
+
+class JdbcBackend(DatabaseBackend):
+    """JayDeBeApi + JPype com o driver JDBC da Oracle (ojdbc)"""
+
+    name = "jdbc"
+
+    def __init__(self, config):
+        self.config = config
+        self.jdbc_driver = config.JDBC_DRIVER
+        self.jdbc_jar = config.JDBC_PATH
+        self.jdbc_url = config.JDBC_URL
+        self.jaydebeapi = None
+        self.jpype = None
+
+    def start(self):
+        """Inicia a JVM para uso do JDBC"""
+        import jaydebeapi
+        import jpype
+        self.jaydebeapi = jaydebeapi
+        self.jpype = jpype
+        try:
+            if not jpype.isJVMStarted():
+                jpype.startJVM(classpath=[self.jdbc_jar], convertStrings=True)
+                logger.info("✅ JVM iniciada com sucesso para JDBC.")
+        except Exception as e:
+            logger.error(f"❌ Erro ao iniciar JVM: {e}")
+            raise
+
+    def attach_thread(self):
+        """Anexa a thread atual à JVM"""
+        if not self.jpype.java.lang.Thread.isAttached():
+            self.jpype.java.lang.Thread.attachAsDaemon()
+
+    def connect(self):
+        """Cria uma nova conexão JDBC"""
+        return self.jaydebeapi.connect(self.jdbc_driver, self.jdbc_url, self._connection_properties())
+
+    def _connection_properties(self):
+        """Propriedades da conexão JDBC (java.util.Properties)"""
+        return {
+            "user": self.config.ORACLE_USER,
+            "password": self.config.ORACLE_PASSWORD,
+            # Cache implícito de statements do driver: prepareStatement com a mesma SQL
+            # reaproveita o cursor já parseado em vez de preparar de novo
+            "oracle.jdbc.implicitStatementCacheSize": str(self.config.DB_STATEMENT_CACHE_SIZE),
+            # Row prefetch padrão das consultas sem fetch_size próprio (o driver usa 10)
+            "defaultRowPrefetch": str(self.config.JDBC_DEFAULT_ROW_PREFETCH),
+        }
+
+    def validate(self, conn):
+        """Connection.isValid do JDBC"""
+        return bool(conn.jconn.isValid(self.config.DB_POOL_VALIDATE_TIMEOUT))
+
+    def execute(self, conn, statement, params, fetch_size=None):
+        prep = self._prepare(conn, statement, params, fetch_size)
+        try:
+            rs = prep.executeQuery()
+            columns, plan = self._result_plan(statement, rs)
+        except Exception:
+            prep.close()
+            raise
+        readers = [(index, getattr(rs, getter)) for index, (getter, _) in enumerate(plan, start=1)]
+
+        def fetch(size=None):
+            """Lê até `size` linhas (todas se None) direto do ResultSet, como tuplas"""
+            rows = []
+            append = rows.append
+            next_row = rs.next
+            while (size is None or len(rows) < size) and next_row():
+                append(tuple([get(index) for index, get in readers]))
+            return rows
+
+        def close():
+            rs.close()
+            # Devolve o statement ao cache implícito da conexão
+            prep.close()
+
+        converters = [converter for _, converter in plan]
+        return QueryResult(columns, converters, [column_kind(converter) for converter in converters], fetch, close)
+
+    def _prepare(self, conn, statement, params, fetch_size=None):
+        """Prepara a SQL (cache implícito do driver), associa os parâmetros e define o
+        fetch size antes da execução, para valer já na primeira ida ao banco"""
+        prep = conn.jconn.prepareStatement(statement.sql)
+        try:
+            for index, value in enumerate(params or [], start=1):
+                if value is None:
+                    prep.setNull(index, JDBC_VARCHAR)
+                else:
+                    prep.setObject(index, value)
+            if fetch_size:
+                prep.setFetchSize(int(fetch_size))
+            if statement.timeout:
+                prep.setQueryTimeout(int(statement.timeout))
+        except Exception:
+            prep.close()
+            raise
+        return prep
+
+    def _result_plan(self, statement, rs):
+        """Colunas e plano de conversão do resultado. Na primeira execução do Statement os
+        metadados são lidos e guardados; nas seguintes só o número de colunas é conferido."""
+        meta = rs.getMetaData()
+        count = meta.getColumnCount()
+        if statement.columns is None or len(statement.columns) != count:
+            columns = [
+                (str(meta.getColumnLabel(i)), int(meta.getColumnType(i)),
+                 int(meta.getPrecision(i)), int(meta.getScale(i)))
+                for i in range(1, count + 1)
+            ]
+            statement.plan = jdbc_column_plan(columns)
+            statement.columns = columns
+        return [column[0] for column in statement.columns], statement.plan
+
+
+class OracledbBackend(DatabaseBackend):
+    """python-oracledb em modo thin: sem JVM nem Oracle Client, tipos Python nativos"""
+
+    name = "oracledb"
+
+    def __init__(self, config):
+        self.config = config
+        self.dsn = f"{config.ORACLE_HOST}:{config.ORACLE_PORT}/{config.ORACLE_SERVICE}"
+        self.oracledb = None
+
+    def start(self):
+        import oracledb
+        self.oracledb = oracledb
+        # CLOBs chegam como str e o prefetch padrão acompanha o do JDBC
+        oracledb.defaults.fetch_lobs = False
+        oracledb.defaults.prefetchrows = self.config.JDBC_DEFAULT_ROW_PREFETCH
+        logger.info("✅ python-oracledb (thin) pronto para uso.")
+
+    def connect(self):
+        conn = self.oracledb.connect(
+            user=self.config.ORACLE_USER,
+            password=self.config.ORACLE_PASSWORD,
+            dsn=self.dsn
+        )
+        conn.stmtcachesize = self.config.DB_STATEMENT_CACHE_SIZE
+        conn.outputtypehandler = self._output_type_handler
+        return conn
+
+    def _output_type_handler(self, cursor, name, default_type, size, precision, scale):
+        """NUMBER com precisão acima de FLOAT_MAX_PRECISION chega como Decimal, como no JDBC
+        (o driver devolveria float e perderia dígitos)"""
+        if default_type == self.oracledb.DB_TYPE_NUMBER and number_converter(precision, scale) is to_decimal:
+            return cursor.var(Decimal, arraysize=cursor.arraysize)
+        return None
+
+    def validate(self, conn):
+        conn.ping()
+        return True
+
+    def execute(self, conn, statement, params, fetch_size=None):
+        cursor = conn.cursor()
+        try:
+            if fetch_size:
+                cursor.prefetchrows = int(fetch_size)
+                cursor.arraysize = int(fetch_size)
+            cursor.execute(translate_placeholders(statement.sql), list(params or []))
+            columns = [desc[0] for desc in cursor.description]
+            kinds = [self._column_kind(desc) for desc in cursor.description]
+        except Exception:
+            cursor.close()
+            raise
+
+        def fetch(size=None):
+            return cursor.fetchall() if size is None else cursor.fetchmany(size)
+
+        # O driver já devolve int/float/Decimal/datetime/str: nenhuma conversão por coluna
+        return QueryResult(columns, [None] * len(columns), kinds, fetch, cursor.close)
+
+    def _column_kind(self, description):
+        """Tipo lógico da coluna a partir do cursor.description (mesmos nomes do JDBC)"""
+        type_code, precision, scale = description[1], description[4], description[5]
+        db = self.oracledb
+        if type_code == db.DB_TYPE_NUMBER:
+            # Mesma regra de tipo do JDBC (int, float, decimal ou number)
+            return column_kind(number_converter(precision, scale))
+        if type_code in (db.DB_TYPE_BINARY_DOUBLE, db.DB_TYPE_BINARY_FLOAT):
+            return "float"
+        if type_code in (db.DB_TYPE_DATE, db.DB_TYPE_TIMESTAMP):
+            return "datetime"
+        return "string"
+
+
+@lru_cache(maxsize=1024)
+def translate_placeholders(sql):
+    """Troca os binds `?` por binds posicionais `:1, :2, ...` (fora de literais)"""
+    parts = []
+    index = 0
+    quote = None
+    for char in sql:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "?":
+            index += 1
+            parts.append(f":{index}")
+            continue
+        parts.append(char)
+    return "".join(parts)
+
+
+BACKENDS = {
+    JdbcBackend.name: JdbcBackend,
+    OracledbBackend.name: OracledbBackend,
+}
+
+
+def create_backend(config):
+    """Instancia o backend configurado em DB_BACKEND"""
+    try:
+        return BACKENDS[config.DB_BACKEND](config)
+    except KeyError:
+        raise ValueError(f"DB_BACKEND inválido: {config.DB_BACKEND} (opções: {', '.join(BACKENDS)})")
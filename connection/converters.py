@@ -0,0 +1,122 @@
+from datetime import datetime
+from decimal import Decimal
+
+"""Conversores de colunas escolhidos uma vez por consulta (a partir dos metadados do ResultSet)
+e aplicados coluna a coluna sobre cada lote de linhas."""
+
+# NUMBER com mais dígitos que isso não cabe em um float sem perda
+FLOAT_MAX_PRECISION = 15
+
+# Constantes de java.sql.Types (e extensões da Oracle) agrupadas por conversão
+JDBC_NUMBER_TYPES = {2, 3, 4, 5, -5, -6}        # NUMERIC, DECIMAL, INTEGER, SMALLINT, BIGINT, TINYINT
+JDBC_FLOAT_TYPES = {6, 7, 8, 100, 101}          # FLOAT, REAL, DOUBLE, BINARY_FLOAT, BINARY_DOUBLE
+JDBC_DATETIME_TYPES = {91, 93}                  # DATE, TIMESTAMP
+JDBC_CLOB_TYPES = {2005, 2011}                  # CLOB, NCLOB
+
+
+def to_int(value):
+    return int(value)
+
+
+def to_float(value):
+    return float(value)
+
+
+def to_decimal(value):
+    return Decimal(value)
+
+
+def to_number(value):
+    """NUMBER sem precisão declarada (ex.: SUM): int quando inteiro, senão float"""
+    text = str(value)
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def to_datetime(value):
+    """Converte o texto de um DATE/TIMESTAMP ('YYYY-MM-DD HH:MM:SS[.fffffffff]') em datetime"""
+    text = str(value)
+    if "." in text:
+        # O JDBC devolve até 9 casas (nanos); o datetime aceita 6
+        head, frac = text.split(".", 1)
+        text = f"{head}.{frac[:6].ljust(6, '0')}"
+    return datetime.fromisoformat(text)
+
+
+def number_converter(precision, scale):
+    """Escolhe o conversor de um NUMBER(precision, scale)"""
+    if precision and scale == 0:
+        return to_int
+    if precision and precision > FLOAT_MAX_PRECISION:
+        return to_decimal
+    if precision and scale > 0:
+        return to_float
+    return to_number
+
+
+# Tipo lógico das colunas de cada conversor, usado no schema dos formatos colunares (Arrow)
+COLUMN_KINDS = {
+    to_int: "int",
+    to_float: "float",
+    to_decimal: "decimal",
+    to_number: "number",
+    to_datetime: "datetime",
+}
+
+
+def column_kind(converter):
+    """Tipo lógico da coluna: int, float, decimal, number, datetime ou string"""
+    return COLUMN_KINDS.get(converter, "string")
+
+
+def jdbc_column_plan(columns):
+    """Para cada coluna (nome, tipo JDBC, precisão, escala), escolhe o getter do ResultSet
+    e o conversor Python. Retorna [(nome do getter, conversor ou None)]."""
+    plan = []
+    for _, jdbc_type, precision, scale in columns:
+        if jdbc_type in JDBC_CLOB_TYPES:
+            plan.append(("getClob", read_clob))
+        elif jdbc_type in JDBC_NUMBER_TYPES:
+            plan.append(("getString", number_converter(precision, scale)))
+        elif jdbc_type in JDBC_FLOAT_TYPES:
+            plan.append(("getString", to_float))
+        elif jdbc_type in JDBC_DATETIME_TYPES:
+            plan.append(("getString", to_datetime))
+        else:
+            # VARCHAR/CHAR e demais tipos: a JVM já devolve str (convertStrings=True)
+            plan.append(("getString", None))
+    return plan
+
+
+def read_clob(clob, chunk_size=32768):
+    """Lê um CLOB JDBC em blocos de `chunk_size` caracteres e libera o locator"""
+    length = clob.length()
+    parts = []
+    position = 1
+    while position <= length:
+        parts.append(str(clob.getSubString(position, min(chunk_size, length - position + 1))))
+        position += chunk_size
+    clob.free()
+    return "".join(parts)
+
+
+def to_columns(rows, converters):
+    """Transpõe um lote de linhas (tuplas) em colunas, aplicando os conversores.
+
+    `converters` tem um item por coluna; None indica que a coluna passa sem conversão.
+    """
+    if not rows:
+        return [[] for _ in converters]
+    columns = list(zip(*rows))
+    for index, converter in enumerate(converters):
+        if converter is not None:
+            columns[index] = [None if value is None else converter(value) for value in columns[index]]
+    return columns
+
+
+def convert_columns(rows, converters):
+    """Aplica os conversores coluna a coluna sobre um lote de linhas (tuplas)"""
+    if not rows or all(converter is None for converter in converters):
+        return rows
+    return list(zip(*to_columns(rows, converters)))
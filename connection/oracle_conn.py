@@ -1,123 +1,402 @@
 from environment.config import Config
-from queue import Queue
+from connection.pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+from connection.singleflight import SingleFlight
+from connection.statements import Statement
+from connection.converters import convert_columns, to_columns
+from connection.backends import create_backend
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from logger.setup_logger import setup_logger, get_logger
-import jaydebeapi
-import jpype
+from monitoring import metrics, tracing
+import asyncio
+import contextvars
+import threading
+import time
 
 setup_logger()
 logger = get_logger(__name__)
 
+
+# Falhas de consulta do bloco track_query_errors() atual (None fora de um bloco)
+_query_errors = contextvars.ContextVar("query_errors", default=None)
+
+
+class QueryErrors:
+    """Quantas consultas falharam dentro de um bloco track_query_errors()"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __bool__(self):
+        return self.count > 0
+
+
+@contextmanager
+def track_query_errors():
+    """Conta as consultas que falharam no bloco. Os métodos do Model devolvem None tanto
+    para "sem dados" quanto para erro; com isto quem chama consegue separar os dois casos."""
+    errors = QueryErrors()
+    token = _query_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _query_errors.reset(token)
+
+
+def _count_query_error():
+    errors = _query_errors.get()
+    if errors is not None:
+        errors.count += 1
+
+
+def as_statement(query):
+    """Aceita um Statement do catálogo ou uma SQL avulsa (sem metadados reaproveitados)"""
+    if isinstance(query, Statement):
+        return query
+    return Statement("adhoc", query)
+
 class OracleConnection:
     def __init__(self):
         self.config = Config()
         self.pool = None
-        self.jdbc_driver = self.config.JDBC_DRIVER
-        self.jdbc_jar = self.config.JDBC_PATH
-        self.jdbc_url = self.config.JDBC_URL
-        self.min_pool = 2
-        self.max_pool = 10
+        self.backend = create_backend(self.config)
+        self.min_pool = self.config.DB_POOL_MIN
+        self.max_pool = self.config.DB_POOL_MAX
+        self._pool_lock = threading.Lock()
+        self.executor = None
+        self.executor_workers = self.config.DB_EXECUTOR_WORKERS
+        self.fetch_batch_size = self.config.DB_FETCH_BATCH_SIZE
+        self.single_flight = SingleFlight() if self.config.DB_SINGLE_FLIGHT else None
+        # O backend (JVM no JDBC) só é iniciado no warm-up ou no primeiro uso, não no import
+        self._started = False
+        self._start_lock = threading.Lock()
+        metrics.register_pool(self.pool_stats)
+        if self.single_flight is not None:
+            metrics.register_single_flight(self.single_flight.stats)
 
-        self._start_jvm()
+    def start(self):
+        """Inicializa o backend uma única vez (bloqueante: no JDBC, sobe a JVM)"""
+        with self._start_lock:
+            if not self._started:
+                self.backend.start()
+                self._started = True
 
-    def _start_jvm(self):
-        """Inicia a JVM para uso do JDBC"""
-        try:
-            if not jpype.isJVMStarted():
-                jpype.startJVM(classpath=[self.jdbc_jar])
-                logger.info("✅ JVM iniciada com sucesso para JDBC.")
-        except Exception as e:
-            logger.error(f"❌ Erro ao iniciar JVM: {e}")
-            raise
+    async def warm_up(self):
+        """Inicia o backend fora do event loop e abre as DB_POOL_MIN conexões iniciais em
+        paralelo, cada uma em uma thread do executor. Retorna a quantidade aberta (None se o
+        pool não pôde ser criado)."""
+        await asyncio.to_thread(self.start)
+        if not self.create_pool(fill=False):
+            return None
+        opened = await asyncio.gather(*(self.run_async(self.pool.fill_one) for _ in range(self.min_pool)))
+        logger.info(f"🔵 Pool {self.backend.name} aquecido com {sum(opened)} conexões.")
+        return sum(opened)
 
-    def create_pool(self):
-        """Cria um pool de conexões JDBC (simulado com Queue)"""
-        try:
-            self.pool = Queue(maxsize=self.max_pool)
-            for _ in range(self.min_pool):
-                conn = self._create_connection()
-                self.pool.put(conn)
-            logger.info(f"🔵 Pool JDBC criado com {self.min_pool} conexões.")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Erro ao criar pool JDBC: {e}")
-            return False
+    def _attach_thread(self):
+        """Initializer das threads do executor (no JDBC, anexa a thread à JVM)"""
+        self.backend.attach_thread()
+
+    def get_executor(self):
+        """Retorna o executor dedicado às chamadas ao banco (criado sob demanda)"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.executor_workers,
+                thread_name_prefix=f"oracle-{self.backend.name}",
+                initializer=self._attach_thread
+            )
+            logger.info(f"🔵 Executor {self.backend.name} criado com {self.executor_workers} threads.")
+        return self.executor
+
+    async def run_async(self, func, *args, **kwargs):
+        """Executa uma função bloqueante no executor do banco sem travar o event loop"""
+        if not self._started:
+            # Primeiro uso sem warm-up: sobe o backend (JVM) fora do event loop
+            await asyncio.to_thread(self.start)
+        loop = asyncio.get_running_loop()
+        call = partial(func, *args, **kwargs)
+        if tracing.current() is not None:
+            # run_in_executor não leva o contexto: sem isso as fases do banco sairiam do trace
+            call = partial(contextvars.copy_context().run, call)
+        return await loop.run_in_executor(self.get_executor(), call)
+
+    async def close(self):
+        """Encerramento do worker: para o executor (consultas na fila são canceladas, as em
+        andamento terminam) e fecha as conexões do pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            logger.info(f"🔵 Executor {self.backend.name} encerrado.")
+        if self.pool:
+            await asyncio.to_thread(self.pool.close)
+            logger.info(f"🔵 Pool {self.backend.name} fechado.")
+
+    def create_pool(self, fill=True):
+        """Cria o pool de conexões limitado a `max_pool` conexões (com `fill`, já abre as
+        `min_pool` conexões iniciais)"""
+        with self._pool_lock:
+            if self.pool:
+                return True
+            try:
+                self.start()
+                pool = ConnectionPool(
+                    create=self._create_connection,
+                    validate=self.backend.validate,
+                    close=self.backend.close,
+                    min_size=self.min_pool,
+                    max_size=self.max_pool,
+                    timeout=self.config.DB_POOL_TIMEOUT,
+                    idle_timeout=self.config.DB_POOL_IDLE_TIMEOUT,
+                    max_lifetime=self.config.DB_POOL_MAX_LIFETIME
+                )
+                if fill:
+                    pool.fill()
+                self.pool = pool
+                logger.info(f"🔵 Pool {self.backend.name} criado com {pool.size} conexões (máximo {self.max_pool}).")
+                return True
+            except Exception as e:
+                logger.error(f"❌ Erro ao criar pool {self.backend.name}: {e}")
+                return False
 
     def _create_connection(self):
-        """Cria uma nova conexão JDBC"""
+        """Cria uma nova conexão com o backend configurado"""
         try:
-            conn = jaydebeapi.connect(
-                self.jdbc_driver,
-                self.jdbc_url,
-                [self.config.ORACLE_USER, self.config.ORACLE_PASSWORD]
-            )
-            return conn
+            return self.backend.connect()
         except Exception as e:
-            logger.error(f"❌ Erro ao criar conexão JDBC: {e}")
+            logger.error(f"❌ Erro ao criar conexão {self.backend.name}: {e}")
             raise
 
     def get_connection(self):
-        """Obtém uma conexão do pool (ou cria nova se pool não estiver pronto)"""
+        """Obtém uma conexão do pool, aguardando até DB_POOL_TIMEOUT se estiver cheio"""
         if not self.pool:
             if not self.create_pool():
                 return None
+        started = time.perf_counter()
         try:
-            if self.pool.empty():
-                logger.warning("⚠️ Pool vazio, criando nova conexão JDBC.")
-                return self._create_connection()
-            return self.pool.get()
+            conn = self.pool.acquire()
+            metrics.db_checkout_wait.observe((), time.perf_counter() - started)
+            return conn
+        except PoolTimeoutError as e:
+            logger.error(f"❌ Timeout ao obter conexão {self.backend.name}: {e}")
+            return None
+        except PoolClosedError:
+            logger.warning(f"⚠️ Pool {self.backend.name} fechado (worker encerrando).")
+            return None
         except Exception as e:
-            logger.error(f"❌ Erro ao obter conexão JDBC: {e}")
+            logger.error(f"❌ Erro ao obter conexão {self.backend.name}: {e}")
             return None
 
     def release_connection(self, conn):
         """Devolve a conexão ao pool"""
         try:
-            if self.pool.qsize() < self.max_pool:
-                self.pool.put(conn)
-            else:
-                conn.close()
+            self.pool.release(conn)
         except Exception as e:
             logger.error(f"❌ Erro ao devolver conexão ao pool: {e}")
 
-    def execute_query(self, query, params=None):
-        """Executa uma query e retorna os resultados com tipos Python"""
+    async def evict_idle(self):
+        """Fecha as conexões ociosas vencidas (DB_POOL_IDLE_TIMEOUT acima do mínimo ou
+        DB_POOL_MAX_LIFETIME). Chamado periodicamente; o trabalho roda fora do event loop"""
+        if not self.pool:
+            return 0
+        evicted = await asyncio.to_thread(self.pool.evict_idle)
+        if evicted:
+            logger.info(f"🔵 {evicted} conexões ociosas fechadas no pool {self.backend.name}.")
+        return evicted
+
+    def pool_stats(self):
+        """Contadores do pool (em uso, ociosas, em espera, tempo de espera)"""
+        if not self.pool:
+            return {"size": 0, "in_use": 0, "idle": 0, "waiters": 0, "max_size": self.max_pool}
+        return self.pool.stats()
+
+    def _iter_batches(self, statement, params, batch_size=None, columnar=False):
+        """Gerador com o núcleo da execução: prepara, executa e devolve (resultado, lote) em
+        lotes de `batch_size` (tudo de uma vez se None). O lote é a lista de linhas
+        convertidas ou, com `columnar`, a lista de colunas."""
+        # Tempos por fase (somados entre os lotes) e linhas, registrados no fim da consulta
+        clock = time.perf_counter
+        waiting = clock()
         connection = self.get_connection()
+        pool_wait = clock() - waiting
+        tracing.record("db.pool_wait", waiting, pool_wait, query=statement.base_name)
         if not connection:
-            return None
+            raise RuntimeError("Nenhuma conexão disponível no pool")
 
+        result = None
+        fetch_time = convert_time = 0.0
+        row_count = batches = 0
+        started = clock()
         try:
-            cursor = connection.cursor()
-            cursor.execute(query, params or [])
-            columns = [str(desc[0]) for desc in cursor.description]
-
-            rows = cursor.fetchall()
-
-            result = []
-            for row in rows:
-                # Converte tipos Java para Python nativos
-                converted_row = []
-                for value in row:
-                    if hasattr(value, "toString"):
-                        value = str(value)  # Converte objetos Java para string
-                    elif isinstance(value, (int, float, str, bool)) or value is None:
-                        pass  # Já é tipo Python nativo
-                    else:
-                        try:
-                            value = str(value)
-                        except:
-                            value = None
-                    converted_row.append(value)
-
-                result.append(dict(zip(columns, converted_row)))
-
-            return result
+            result = self.backend.execute(connection, statement, params, statement.fetch_size or batch_size)
+            execute_time = clock() - started
+            while True:
+                mark = clock()
+                rows = result.fetch(batch_size)
+                converted = clock()
+                # Conversores escolhidos uma única vez e aplicados coluna a coluna
+                if columnar:
+                    batch = to_columns(rows, result.converters)
+                else:
+                    batch = convert_columns(rows, result.converters)
+                fetch_time += converted - mark
+                convert_time += clock() - converted
+                row_count += len(rows)
+                batches += 1
+                yield result, batch
+                if batch_size is None or len(rows) < batch_size:
+                    break
+        except Exception:
+            metrics.db_query_errors.inc((statement.base_name,))
+            raise
+        finally:
+            try:
+                if result is not None:
+                    result.close()
+            finally:
+                # Devolve a conexão mesmo se o fechamento do cursor falhar
+                self.release_connection(connection)
+            if result is not None:
+                metrics.db_query_duration.observe((statement.base_name, "execute"), execute_time)
+                metrics.db_query_duration.observe((statement.base_name, "fetch"), fetch_time)
+                metrics.db_query_duration.observe((statement.base_name, "convert"), convert_time)
+                metrics.db_query_rows.inc((statement.base_name,), row_count)
+                name = statement.base_name
+                tracing.record("db.execute", started, execute_time, query=name)
+                tracing.record("db.fetch", started + execute_time, fetch_time, query=name, batches=batches)
+                tracing.record("db.convert", started + execute_time, convert_time, query=name, rows=row_count)
+                tracing.slow_query_log.check(statement, params, {
+                    "pool_wait": pool_wait, "execute": execute_time, "fetch": fetch_time, "convert": convert_time,
+                }, row_count)
+
+    def execute_query(self, query, params=None):
+        """Executa uma query e retorna os resultados com tipos Python (lista de dicts).
 
+        `query` pode ser um Statement do catálogo ou uma SQL avulsa.
+        """
+        result = self.execute_query_rows(query, params)
+        if result is None:
+            return None
+        columns, rows = result
+        return [dict(zip(columns, row)) for row in rows]
+
+    def execute_query_rows(self, query, params=None):
+        """Executa uma query e retorna (nomes das colunas, linhas em tuplas), sem montar um
+        dict por linha. Base da resposta JSON compacta."""
+        statement = as_statement(query)
+        batches = None
+        try:
+            batches = self._iter_batches(statement, params)
+            result, rows = next(batches)
+            return result.columns, rows
         except Exception as e:
-            logger.info(f"❌ Erro ao executar query JDBC: {e}")
+            logger.info(f"❌ Erro ao executar query {self.backend.name} ({statement.name}): {e}")
             return None
         finally:
-            cursor.close()
-            self.release_connection(connection)
+            if batches is not None:
+                batches.close()
+
+    def execute_query_iter(self, query, params=None, batch_size=None):
+        """Gerador que executa a query e devolve os resultados em lotes (listas de dicts).
+
+        Usa fetch em lotes de `batch_size` linhas (DB_FETCH_BATCH_SIZE por padrão), então
+        a memória fica limitada a um lote. A conexão fica reservada até o gerador terminar
+        ou ser fechado.
+        """
+        statement = as_statement(query)
+        batch_size = batch_size or self.fetch_batch_size
+        try:
+            for result, rows in self._iter_batches(statement, params, batch_size):
+                if rows:
+                    yield [dict(zip(result.columns, row)) for row in rows]
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar query {self.backend.name} em lotes ({statement.name}): {e}")
+            raise
+
+    def execute_query_columns_iter(self, query, params=None, batch_size=None):
+        """Como execute_query_iter, mas cada lote vem em colunas: (nomes, tipos, colunas).
+
+        Usado pelos formatos colunares (Arrow, Parquet, CSV), sem criar um dict por linha.
+        O primeiro lote é sempre devolvido, mesmo vazio, para que o schema seja conhecido.
+        """
+        statement = as_statement(query)
+        batch_size = batch_size or self.fetch_batch_size
+        try:
+            first = True
+            for result, columns in self._iter_batches(statement, params, batch_size, columnar=True):
+                if first or (columns and len(columns[0])):
+                    yield result.columns, result.kinds, columns
+                first = False
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar query {self.backend.name} em lotes ({statement.name}): {e}")
+            raise
+
+    async def execute_query_async(self, query, params=None):
+        """Versão assíncrona de execute_query, executada no executor do banco.
+
+        Chamadas concorrentes com a mesma query e parâmetros compartilham uma única
+        execução (single-flight); o resultado devolvido é o mesmo objeto para todos.
+        """
+        return await self._run_coalesced(self.execute_query, query, params)
+
+    async def execute_query_rows_async(self, query, params=None):
+        """Versão assíncrona de execute_query_rows (também com single-flight)"""
+        return await self._run_coalesced(self.execute_query_rows, query, params)
+
+    async def _run_coalesced(self, func, query, params):
+        try:
+            if self.single_flight is None:
+                result = await self.run_async(func, query, params)
+            else:
+                key = (func.__name__, as_statement(query).sql, tuple(params or ()))
+                result = await self.single_flight.do(key, lambda: self.run_async(func, query, params))
+        except Exception:
+            _count_query_error()
+            raise
+        if result is None:
+            # execute_query/execute_query_rows só devolvem None em caso de erro
+            _count_query_error()
+        return result
+
+    def execute_query_aiter(self, query, params=None, batch_size=None):
+        """Versão assíncrona de execute_query_iter: cada lote é buscado no executor do banco"""
+        return self._aiterate(self.execute_query_iter(query, params, batch_size))
+
+    def execute_query_columns_aiter(self, query, params=None, batch_size=None):
+        """Versão assíncrona de execute_query_columns_iter"""
+        return self._aiterate(self.execute_query_columns_iter(query, params, batch_size))
+
+    async def _aiterate(self, batches):
+        """Consome um gerador de lotes no executor do banco, um lote por vez.
+
+        Se o consumidor sai no meio (ex.: cliente desconectou do stream), espera o lote em
+        andamento na thread do executor terminar antes de fechar o gerador: fechá-lo enquanto
+        executa falharia ("generator already executing") e a conexão não voltaria ao pool.
+        """
+        fetch = None
+        try:
+            while True:
+                fetch = asyncio.ensure_future(self.run_async(next, batches, None))
+                # shield: um cancelamento aqui não abandona o next() que continua na thread
+                batch = await asyncio.shield(fetch)
+                fetch = None
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            # Em uma task própria: termina (e devolve a conexão) mesmo se formos cancelados de novo
+            await asyncio.shield(asyncio.ensure_future(self._close_batches(batches, fetch)))
+
+    async def _close_batches(self, batches, fetch):
+        """Espera o lote em andamento (se houver) e fecha o gerador no executor"""
+        if fetch is not None:
+            try:
+                await fetch
+            except Exception:
+                pass
+        try:
+            await self.run_async(batches.close)
+        except Exception as e:
+            logger.error(f"❌ Erro ao fechar consulta em lotes {self.backend.name}: {e}")
 
 
 # Instância global
@@ -0,0 +1,256 @@
+from logger.setup_logger import setup_logger, get_logger
+import threading
+import time
+
+setup_logger()
+logger = get_logger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Nenhuma conexão ficou disponível dentro do tempo limite de checkout"""
+
+
+class PoolClosedError(Exception):
+    """Checkout em um pool já fechado (encerramento do worker)"""
+
+
+class PooledConnection:
+    """Conexão física mantida pelo pool, com os tempos usados na eviction"""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Pool de conexões limitado e thread-safe.
+
+    Nunca mantém mais que `max_size` conexões abertas (em uso + ociosas). Quando
+    o pool está cheio, o checkout espera até `timeout` segundos por uma devolução.
+    Conexões ociosas há mais de `idle_timeout` (acima de `min_size`) ou abertas há
+    mais de `max_lifetime` são fechadas, e toda conexão é validada no checkout.
+    """
+
+    def __init__(self, create, validate=None, close=None, min_size=2, max_size=10,
+                 timeout=30.0, idle_timeout=300.0, max_lifetime=3600.0):
+        self._create = create
+        self._validate = validate
+        self._close = close or (lambda conn: conn.close())
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+
+        self._idle = []
+        self._in_use = {}
+        self._opening = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.waiters = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.created = 0
+        self.closed = 0
+        self.validation_failures = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def size(self):
+        """Total de conexões abertas (ou sendo abertas) pelo pool"""
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def fill(self):
+        """Abre conexões até atingir `min_size`"""
+        while self.fill_one():
+            pass
+
+    def fill_one(self):
+        """Abre uma conexão se o pool ainda não tem `min_size`. Pode ser chamado por várias
+        threads ao mesmo tempo para abrir as conexões iniciais em paralelo."""
+        with self._cond:
+            if self._closed or self.size >= self.min_size:
+                return False
+            self._opening += 1
+        pooled = self._open()
+        with self._cond:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return True
+        self._discard(pooled)
+        return False
+
+    def acquire(self, timeout=None):
+        """Obtém uma conexão válida, esperando no máximo `timeout` segundos"""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            pooled = None
+            expired = []
+            with self._cond:
+                self.waiters += 1
+                try:
+                    while True:
+                        if self._closed:
+                            raise PoolClosedError("Pool de conexões fechado")
+                        expired.extend(self._evict_expired())
+                        if self._idle:
+                            pooled = self._idle.pop()
+                            break
+                        if self.size < self.max_size:
+                            self._opening += 1
+                            break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise PoolTimeoutError(
+                                f"Nenhuma conexão disponível em {timeout:.1f}s "
+                                f"({len(self._in_use)} em uso, max={self.max_size})"
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiters -= 1
+
+            for old in expired:
+                self._discard(old)
+
+            if pooled is None:
+                try:
+                    pooled = self._open()
+                except Exception:
+                    with self._cond:
+                        self._cond.notify()
+                    raise
+            elif not self._is_valid(pooled):
+                self._discard(pooled)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                closed = self._closed
+                if not closed:
+                    self._in_use[id(pooled.conn)] = pooled
+                self.checkouts += 1
+                self.wait_time_total += waited
+                if waited > self.wait_time_max:
+                    self.wait_time_max = waited
+            if closed:
+                # Fechado enquanto a conexão era aberta/validada
+                self._discard(pooled)
+                raise PoolClosedError("Pool de conexões fechado")
+            return pooled.conn
+
+    def release(self, conn, discard=False):
+        """Devolve a conexão ao pool (ou a fecha se `discard`, se expirou ou se o pool
+        já foi fechado)"""
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+            if pooled is None:
+                logger.warning("⚠️ Conexão devolvida não pertence ao pool, fechando.")
+            elif not discard and not self._closed and not self._is_expired(pooled, time.monotonic()):
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+            self._cond.notify()
+        self._discard(pooled or PooledConnection(conn))
+
+    def evict_idle(self):
+        """Fecha as conexões ociosas que ultrapassaram os limites de tempo"""
+        with self._cond:
+            expired = self._evict_expired()
+        for pooled in expired:
+            self._discard(pooled)
+        return len(expired)
+
+    def close(self):
+        """Fecha todas as conexões ociosas; as em uso são fechadas ao serem devolvidas.
+        Depois disso, acquire() levanta PoolClosedError"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self.min_size = 0
+            # Acorda quem espera no checkout para receber o PoolClosedError
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        """Contadores do pool"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "is_closed": self._closed,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiters": self.waiters,
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "closed": self.closed,
+                "validation_failures": self.validation_failures,
+                "wait_time_total": round(self.wait_time_total, 6),
+                "wait_time_max": round(self.wait_time_max, 6),
+            }
+
+    def _open(self):
+        try:
+            pooled = PooledConnection(self._create())
+        finally:
+            with self._cond:
+                self._opening -= 1
+        with self._cond:
+            self.created += 1
+        return pooled
+
+    def _is_expired(self, pooled, now):
+        return self.max_lifetime and now - pooled.created_at > self.max_lifetime
+
+    def _evict_expired(self):
+        """Remove (sem fechar) as conexões ociosas expiradas. Chamar com o lock"""
+        now = time.monotonic()
+        keep, expired = [], []
+        # As mais antigas ficam no início da lista; só as excedentes a min_size
+        # podem ser removidas por ociosidade
+        surplus = len(self._idle) + len(self._in_use) - self.min_size
+        for pooled in self._idle:
+            idle_for = now - pooled.last_used
+            if self._is_expired(pooled, now) or (
+                    self.idle_timeout and surplus > 0 and idle_for > self.idle_timeout):
+                expired.append(pooled)
+                surplus -= 1
+            else:
+                keep.append(pooled)
+        self._idle = keep
+        return expired
+
+    def _is_valid(self, pooled):
+        if self._validate is None:
+            return True
+        try:
+            if self._validate(pooled.conn):
+                return True
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao validar conexão: {e}")
+        with self._cond:
+            self.validation_failures += 1
+        return False
+
+    def _discard(self, pooled):
+        try:
+            self._close(pooled.conn)
+        except Exception as e:
+            logger.error(f"❌ Erro ao fechar conexão do pool: {e}")
+        with self._cond:
+            self.closed += 1
+            self._cond.notify()
@@ -0,0 +1,41 @@
+import asyncio
+
+
+class SingleFlight:
+    """Agrupa chamadas idênticas e concorrentes em uma única execução.
+
+    Enquanto uma chamada com a mesma chave está em andamento, as seguintes aguardam o
+    mesmo resultado em vez de executar de novo. A execução roda em uma task própria,
+    então o cancelamento de quem a iniciou não afeta os demais.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Executa `func()` (coroutine) ou aguarda a execução já em andamento para `key`"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        return len(self._calls)
+
+    def stats(self):
+        """Execuções reais, chamadas que aproveitaram uma execução em andamento e em curso"""
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Evita o aviso de exceção não lida quando todos os chamadores foram cancelados
+        if not task.cancelled():
+            task.exception()
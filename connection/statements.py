@@ -0,0 +1,95 @@
+import textwrap
+import threading
+
+"""Catálogo de consultas nomeadas. Cada Statement guarda a SQL, os nomes dos parâmetros e
+as opções de execução, e recebe na primeira execução os metadados do resultado (colunas e
+conversores), que passam a ser reaproveitados nas execuções seguintes."""
+
+
+def count_placeholders(sql):
+    """Conta os binds `?` fora de literais ('...') e identificadores ("...")"""
+    count = 0
+    quote = None
+    for char in sql:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "?":
+            count += 1
+    return count
+
+
+class Statement:
+    """Consulta registrada no catálogo"""
+
+    def __init__(self, name, sql, params=(), fetch_size=None, timeout=None, template=False):
+        self.name = name
+        # Nome da consulta do catálogo, igual em todas as variações (label das métricas)
+        self.base_name = name
+        self.sql = textwrap.dedent(sql).strip()
+        self.params = tuple(params)
+        # Linhas trazidas por ida ao banco (row prefetch); None usa o padrão da conexão
+        self.fetch_size = fetch_size
+        self.timeout = timeout
+        self.template = template
+        self.param_count = None if template else count_placeholders(self.sql)
+        if self.params and self.param_count is not None and len(self.params) != self.param_count:
+            raise ValueError(
+                f"Consulta {name}: {self.param_count} binds na SQL, {len(self.params)} parâmetros declarados")
+
+        # Metadados do resultado, preenchidos na primeira execução
+        self.columns = None
+        self.plan = None
+
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def variant(self, key, sql):
+        """Retorna (criando uma vez) uma variação derivada desta consulta, ex. página keyset
+        ou lista IN de tamanho fixo. A variação herda as opções de execução."""
+        statement = self._variants.get(key)
+        if statement is None:
+            with self._lock:
+                statement = self._variants.get(key)
+                if statement is None:
+                    statement = Statement(f"{self.name}[{key}]", sql, fetch_size=self.fetch_size,
+                                          timeout=self.timeout)
+                    statement.base_name = self.base_name
+                    self._variants[key] = statement
+        return statement
+
+    def format(self, **kwargs):
+        """Variação de uma consulta-modelo ({placeholders}, ...), cacheada pelos argumentos"""
+        key = ",".join(f"{name}={value}" for name, value in sorted(kwargs.items()))
+        return self.variant(key, self.sql.format(**kwargs))
+
+    def __repr__(self):
+        return f"Statement({self.name!r})"
+
+
+class QueryCatalog:
+    """Registro das consultas nomeadas da aplicação"""
+
+    def __init__(self):
+        self._statements = {}
+
+    def register(self, name, sql, params=(), fetch_size=None, timeout=None, template=False):
+        if name in self._statements:
+            raise ValueError(f"Consulta já registrada: {name}")
+        statement = Statement(name, sql, params, fetch_size, timeout, template)
+        self._statements[name] = statement
+        return statement
+
+    def get(self, name):
+        return self._statements[name]
+
+    def names(self):
+        return list(self._statements)
+
+    def __iter__(self):
+        return iter(self._statements.values())
+
+
+catalog = QueryCatalog()
@@ -15,6 +15,55 @@ class Config:
     JDBC_PATH = os.getenv('JDBC_PATH')
     JDBC_DRIVER = os.getenv('JDBC_DRIVER')
     JDBC_URL = f'jdbc:oracle:thin:@{ORACLE_HOST}:{ORACLE_PORT}/{ORACLE_SERVICE}'
+    DB_BACKEND = os.getenv('DB_BACKEND', 'jdbc')
+    DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', 10))
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 2))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', 3600))
+    DB_POOL_VALIDATE_TIMEOUT = int(os.getenv('DB_POOL_VALIDATE_TIMEOUT', 2))
+    DB_POOL_EVICT_INTERVAL = float(os.getenv('DB_POOL_EVICT_INTERVAL', 60))
+    DB_FETCH_BATCH_SIZE = int(os.getenv('DB_FETCH_BATCH_SIZE', 500))
+    JDBC_DEFAULT_ROW_PREFETCH = int(os.getenv('JDBC_DEFAULT_ROW_PREFETCH', 50))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 50))
+    DB_SINGLE_FLIGHT = os.getenv('DB_SINGLE_FLIGHT', 'true').lower() == 'true'
+    PAGE_DEFAULT_LIMIT = int(os.getenv('PAGE_DEFAULT_LIMIT', 100))
+    PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', 1000))
+    BATCH_MAX_CODES = int(os.getenv('BATCH_MAX_CODES', 5000))
+    BATCH_IN_CHUNK_SIZE = int(os.getenv('BATCH_IN_CHUNK_SIZE', 500))
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 20))
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    CACHE_TTL_ANSWER_TABLE = float(os.getenv('CACHE_TTL_ANSWER_TABLE', 300))
+    CACHE_TTL_PROMOS = float(os.getenv('CACHE_TTL_PROMOS', 300))
+    CACHE_STALE_TTL = float(os.getenv('CACHE_STALE_TTL', 600))
+    SALES_DAY_CACHE_MAX_DAYS = int(os.getenv('SALES_DAY_CACHE_MAX_DAYS', 50000))
+    SALES_DAY_CACHE_TTL = float(os.getenv('SALES_DAY_CACHE_TTL', 86400))
+    SALES_DAY_CACHE_OPEN_DAYS = int(os.getenv('SALES_DAY_CACHE_OPEN_DAYS', 1))
+    RANGE_SPLIT_DAYS = int(os.getenv('RANGE_SPLIT_DAYS', 31))
+    RANGE_SPLIT_MAX_PARTS = int(os.getenv('RANGE_SPLIT_MAX_PARTS', 4))
+    SNAPSHOT_FILIAIS = [int(code) for code in os.getenv('SNAPSHOT_FILIAIS', '').split(',') if code.strip()]
+    SNAPSHOT_REFRESH_INTERVAL = float(os.getenv('SNAPSHOT_REFRESH_INTERVAL', 300))
+    PROMO_INDEX_FILIAIS = [int(code) for code in os.getenv('PROMO_INDEX_FILIAIS', '').split(',') if code.strip()]
+    PROMO_INDEX_REFRESH_INTERVAL = float(os.getenv('PROMO_INDEX_REFRESH_INTERVAL', 300))
+    EMITENTE_MAP_REFRESH_INTERVAL = float(os.getenv('EMITENTE_MAP_REFRESH_INTERVAL', 600))
+    TOKEN_CACHE_ENABLED = os.getenv('TOKEN_CACHE_ENABLED', 'true').lower() == 'true'
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', 10000))
+    AUTH_BCRYPT_WORKERS = int(os.getenv('AUTH_BCRYPT_WORKERS', 2))
+    AUTH_CREDENTIAL_CACHE_TTL = float(os.getenv('AUTH_CREDENTIAL_CACHE_TTL', 300))
+    AUTH_CREDENTIAL_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_CREDENTIAL_CACHE_MAX_ENTRIES', 1000))
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'true').lower() == 'true'
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 0))
+    TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', 200))
+    SLOW_QUERY_THRESHOLD = float(os.getenv('SLOW_QUERY_THRESHOLD', 2))
+    SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 1))
+    SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', 100))
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
 
 class ConfigAuth:
     SECRET_KEY = os.getenv('SECRET_KEY')
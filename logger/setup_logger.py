@@ -1,10 +1,17 @@
 import logging
 
+_configured = False
+
 def setup_logger():
+    """Configura o logging uma única vez por processo (os módulos chamam no import)"""
+    global _configured
+    if _configured:
+        return
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(levelname)s - %(message)s"
     )
+    _configured = True
 
 def get_logger(name: str = __name__):
     return logging.getLogger(name)
@@ -1,9 +1,72 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routes.route import client_router
 from routes.token import token_router
+from routes.admin import admin_router
+from routes.health import health_router, warm_up
+from routes.metrics import metrics_router
+from routes.responses import FastJSONResponse
+from monitoring.metrics import MetricsMiddleware
+from monitoring.tracing import TracingMiddleware
+from models.emitentes import emitente_map
+from models.snapshot import price_snapshots
+from models.search import promo_index
+from models.scheduler import PeriodicTask
+from connection.oracle_conn import oracle_db
+from environment.config import Config
+import asyncio
+import contextlib
 
-app = FastAPI()
+# Snapshots em memória recarregados em segundo plano
+SNAPSHOT_STORES = (price_snapshots, promo_index)
+
+# Fecha as conexões ociosas do pool que passaram dos limites de tempo
+pool_evictor = PeriodicTask("Conexões ociosas do pool", oracle_db.evict_idle, Config.DB_POOL_EVICT_INTERVAL)
+
+
+def start_background_tasks():
+    for store in SNAPSHOT_STORES:
+        if store.filiais:
+            store.refresher.start()
+    emitente_map.refresher.start()
+    pool_evictor.start()
+
+
+async def stop_background_tasks():
+    for store in SNAPSHOT_STORES:
+        await store.refresher.stop()
+    await emitente_map.refresher.stop()
+    await pool_evictor.stop()
+
+
+async def warm_up_then_start():
+    """Warm-up (JVM, pool, consulta teste) e, depois dele, as tarefas que usam o banco"""
+    await warm_up.wait()
+    start_background_tasks()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # O servidor começa a aceitar conexões sem esperar o warm-up: /health/live responde
+    # na hora e /health/ready só quando o banco estiver pronto
+    warm_up.start()
+    background = asyncio.create_task(warm_up_then_start())
+    yield
+    background.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await background
+    await warm_up.cancel()
+    await stop_background_tasks()
+    await oracle_db.close()
+
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 # Inclui o router com prefixo e tags
 app.include_router(token_router, tags=["Autenticação"])
 app.include_router(client_router, prefix="/info", tags=["Cliente"])
+app.include_router(admin_router, prefix="/admin", tags=["Administração"])
+app.include_router(health_router, prefix="/health", tags=["Saúde"])
+app.include_router(metrics_router, tags=["Saúde"])
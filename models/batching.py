@@ -0,0 +1,32 @@
+"""Auxiliares para consultas em lote com listas IN (...) de binds."""
+
+# Tamanhos de lista usados nos IN (...): as listas são completadas até o próximo
+# tamanho para que o banco (e o cache de statements) veja poucas variações de SQL
+IN_LIST_BUCKETS = (1, 10, 50, 100, 250, 500, 1000)
+
+
+def unique_codes(codes):
+    """Remove duplicados preservando a ordem"""
+    return list(dict.fromkeys(codes))
+
+
+def chunked(values, size):
+    """Fatia `values` em listas de no máximo `size` itens"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def in_list(values):
+    """Retorna ("?, ?, ...", params) para um IN (...), completando a lista até o bucket"""
+    size = next((bucket for bucket in IN_LIST_BUCKETS if bucket >= len(values)), len(values))
+    params = list(values) + [values[-1]] * (size - len(values))
+    return ", ".join("?" * size), params
+
+
+def group_by_key(rows, key_column, codes):
+    """Agrupa as linhas por `key_column`. Retorna ({código: [linhas]}, [códigos sem linhas])"""
+    found = {}
+    for row in rows:
+        found.setdefault(row[key_column], []).append(row)
+    missing = [code for code in codes if code not in found]
+    return found, missing
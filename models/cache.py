@@ -0,0 +1,228 @@
+from collections import OrderedDict
+from environment.config import Config
+from functools import wraps
+from logger.setup_logger import setup_logger, get_logger
+import asyncio
+import sys
+import time
+
+setup_logger()
+logger = get_logger(__name__)
+
+# Quantidade de linhas usada para estimar o tamanho de resultados grandes
+SIZE_SAMPLE_ROWS = 100
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "expires_at", "stale_until", "refreshing", "derived")
+
+    def __init__(self, cache, value, size, ttl, stale_ttl):
+        now = time.monotonic()
+        self.value = value
+        # Tamanho do valor mais o dos dados derivados
+        self.size = size
+        self.expires_at = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+        self.refreshing = False
+        # Dados derivados do valor (ex.: corpo serializado e ETag), descartados com a entrada
+        self.derived = DerivedData(cache, self)
+
+
+class DerivedData(dict):
+    """Dados derivados de uma entrada. Cada atribuição recalcula o tamanho deles, que entra
+    no limite de bytes do cache (atribua de novo a mesma chave depois de um objeto crescer)."""
+
+    def __init__(self, cache, entry):
+        super().__init__()
+        self._cache = cache
+        self._entry = entry
+        self.size = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        size = sum(_estimate_size(item) for item in self.values())
+        self._cache._resize(self._entry, size - self.size)
+        self.size = size
+
+
+class QueryCache:
+    """Cache em memória dos resultados das consultas do Model.
+
+    Chave: (nome da consulta, parâmetros). Cada entrada tem seu TTL; depois de expirar,
+    continua sendo servida por mais `stale_ttl` segundos enquanto uma atualização roda em
+    segundo plano (stale-while-revalidate). O total é limitado a `max_bytes` (estimado),
+    descartando as entradas usadas há mais tempo (LRU).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._tasks = set()
+        # id(valor) -> entrada, para achar os dados derivados a partir do valor devolvido
+        self._by_value = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def get_or_load(self, query, params, loader, ttl, stale_ttl=0):
+        """Retorna o valor em cache ou executa `loader()` (coroutine) e guarda o resultado"""
+        key = (query, params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            if now < entry.expires_at:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry.value
+
+        self.misses += 1
+        value = await loader()
+        self.set(query, params, value, ttl, stale_ttl)
+        return value
+
+    def set(self, query, params, value, ttl, stale_ttl=0):
+        """Guarda um valor (resultados vazios/None não são guardados)"""
+        if value is None:
+            return
+        key = (query, params)
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        entry = CacheEntry(self, value, size, ttl, stale_ttl)
+        self._entries[key] = entry
+        self._by_value[id(value)] = entry
+        self.current_bytes += size
+        self._evict()
+
+    def invalidate(self, query=None, key=None):
+        """Remove as entradas da consulta `query` e/ou com os parâmetros `key` ("1,abc").
+
+        Sem argumentos, limpa o cache inteiro. Retorna a quantidade removida.
+        """
+        removed = 0
+        for entry_key in list(self._entries):
+            entry_query, entry_params = entry_key
+            if query is not None and entry_query != query:
+                continue
+            if key is not None and format_key(entry_params) != key:
+                continue
+            self._remove(entry_key)
+            removed += 1
+        return removed
+
+    def derived(self, value):
+        """Dicionário de dados derivados da entrada que guarda `value` (o mesmo objeto
+        devolvido por get_or_load). None se o valor não está em cache."""
+        entry = self._by_value.get(id(value))
+        if entry is None or entry.value is not value:
+            return None
+        return entry.derived
+
+    def stats(self):
+        """Contadores do cache"""
+        queries = {}
+        for entry_query, _ in self._entries:
+            queries[entry_query] = queries.get(entry_query, 0) + 1
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "queries": queries,
+        }
+
+    async def _refresh(self, key, loader, ttl, stale_ttl):
+        query, params = key
+        try:
+            value = await loader()
+            self.refreshes += 1
+            if value is not None:
+                self.set(query, params, value, ttl, stale_ttl)
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.error(f"❌ Erro ao atualizar cache de {query}: {e}")
+        finally:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def _resize(self, entry, delta):
+        """Ajusta o tamanho de uma entrada (dados derivados) e descarta as LRU se passar do limite"""
+        if self._by_value.get(id(entry.value)) is not entry:
+            return
+        entry.size += delta
+        self.current_bytes += delta
+        self._evict()
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            old_key = next(iter(self._entries))
+            self._remove(old_key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+            if self._by_value.get(id(entry.value)) is entry:
+                del self._by_value[id(entry.value)]
+
+
+def format_key(params):
+    """Representação textual dos parâmetros, usada pelo endpoint de invalidação"""
+    return ",".join(str(param) for param in params)
+
+
+def _estimate_size(value):
+    """Estimativa (aproximada) da memória ocupada por um resultado"""
+    if isinstance(value, list):
+        if not value:
+            return sys.getsizeof(value)
+        sample = value[:SIZE_SAMPLE_ROWS]
+        per_item = sum(_estimate_size(item) for item in sample) / len(sample)
+        return sys.getsizeof(value) + int(per_item * len(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    if hasattr(value, "nbytes"):
+        # Objetos com tamanho próprio (ex.: RenderedBody)
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+query_cache = QueryCache(Config.CACHE_MAX_BYTES)
+
+
+def cached(query, ttl, stale_ttl=0):
+    """Decorator que guarda em `query_cache` o resultado de um método assíncrono do Model"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args):
+            if not Config.CACHE_ENABLED:
+                return await func(*args)
+            return await query_cache.get_or_load(query, args, lambda: func(*args), ttl, stale_ttl)
+        return wrapper
+    return decorator
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from environment.config import Config
+import asyncio
+import time
+
+"""Cache por dia das consultas de vendas por período. Cada dia fechado (anterior aos
+últimos SALES_DAY_CACHE_OPEN_DAYS) é guardado como um bucket com as linhas daquele dia;
+um período pede ao Oracle só os dias que faltam ou ainda estão abertos, agrupados em
+faixas contínuas, e junta o resto do cache."""
+
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def parse_date(text):
+    """'DD/MM/YYYY' -> date (ValueError se inválida)"""
+    return datetime.strptime(text.strip(), DATE_FORMAT).date()
+
+
+def format_date(day):
+    return day.strftime(DATE_FORMAT)
+
+
+def day_of(row, column="DATA"):
+    value = row[column]
+    return value.date() if isinstance(value, datetime) else value
+
+
+def merge_runs(runs, max_runs):
+    """Junta as faixas separadas pelos menores intervalos até sobrarem `max_runs`. Os dias
+    já em cache no meio de uma faixa juntada são consultados de novo, mas uma faixa por
+    buraco do cache multiplicaria as consultas."""
+    runs = [list(run) for run in runs]
+    while len(runs) > max(1, max_runs):
+        index = min(range(len(runs) - 1), key=lambda i: runs[i + 1][0] - runs[i][1])
+        runs[index][1] = runs.pop(index + 1)[1]
+    return [tuple(run) for run in runs]
+
+
+def contiguous_runs(days):
+    """Agrupa datas ordenadas em faixas contínuas [(início, fim)]"""
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+class DayBucketCache:
+    """Buckets (consulta, chave, dia) -> linhas, com TTL e limite de buckets (LRU)"""
+
+    def __init__(self, max_days, ttl, open_days):
+        self.max_days = max_days
+        self.ttl = ttl
+        self.open_days = open_days
+        self._buckets = OrderedDict()
+
+        self.day_hits = 0
+        self.day_misses = 0
+        self.queries = 0
+
+    def _closed(self, day):
+        """Dias anteriores aos `open_days` mais recentes não mudam mais (até o TTL)"""
+        return day <= date.today() - timedelta(days=self.open_days)
+
+    def _get(self, bucket_key):
+        entry = self._buckets.get(bucket_key)
+        if entry is None:
+            return None
+        rows, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._buckets[bucket_key]
+            return None
+        self._buckets.move_to_end(bucket_key)
+        return rows
+
+    def _set(self, bucket_key, rows):
+        self._buckets[bucket_key] = (rows, time.monotonic() + self.ttl)
+        self._buckets.move_to_end(bucket_key)
+        while len(self._buckets) > self.max_days:
+            self._buckets.popitem(last=False)
+
+    async def get_range(self, query, key, start, end, loader, max_runs=None):
+        """Linhas de `start` a `end` (dates), na ordem dos dias.
+
+        `loader(início, fim)` é uma coroutine que consulta o Oracle para uma faixa e
+        retorna a lista de linhas (com a coluna DATA) ou None em caso de erro. Com
+        `max_runs`, os dias ausentes são consultados em no máximo `max_runs` faixas.
+        """
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        cached = {}
+        missing = []
+        for day in days:
+            rows = self._get((query, key, day)) if self._closed(day) else None
+            if rows is None:
+                missing.append(day)
+            else:
+                cached[day] = rows
+        self.day_hits += len(cached)
+        self.day_misses += len(missing)
+
+        runs = contiguous_runs(missing)
+        if max_runs is not None:
+            runs = merge_runs(runs, max_runs)
+        self.queries += len(runs)
+        results = await asyncio.gather(*(loader(run_start, run_end) for run_start, run_end in runs))
+        if any(result is None for result in results):
+            return None
+
+        fresh = {day: [] for day in missing}
+        for result in results:
+            for row in result:
+                day = day_of(row)
+                # Dias já em cache dentro de uma faixa juntada ficam com o bucket do cache
+                if day in fresh:
+                    fresh[day].append(row)
+        for day in missing:
+            if self._closed(day):
+                # Dias sem venda também são guardados (bucket vazio)
+                self._set((query, key, day), fresh[day])
+
+        rows = []
+        for day in days:
+            rows.extend(cached[day] if day in cached else fresh[day])
+        return rows
+
+    def invalidate(self, query=None, key=None):
+        """Remove os buckets da consulta `query` e/ou da chave `key` ("123")"""
+        removed = 0
+        for bucket_key in list(self._buckets):
+            bucket_query, bucket_owner, _ = bucket_key
+            if query is not None and bucket_query != query:
+                continue
+            if key is not None and str(bucket_owner) != key:
+                continue
+            del self._buckets[bucket_key]
+            removed += 1
+        return removed
+
+    def stats(self):
+        return {
+            "buckets": len(self._buckets),
+            "max_buckets": self.max_days,
+            "day_hits": self.day_hits,
+            "day_misses": self.day_misses,
+            "queries": self.queries,
+        }
+
+
+sales_day_cache = DayBucketCache(
+    Config.SALES_DAY_CACHE_MAX_DAYS, Config.SALES_DAY_CACHE_TTL, Config.SALES_DAY_CACHE_OPEN_DAYS)
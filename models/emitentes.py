@@ -0,0 +1,75 @@
+from connection.oracle_conn import oracle_db
+from environment.config import Config
+from logger.setup_logger import setup_logger, get_logger
+from models import queries
+from models.scheduler import PeriodicTask
+
+setup_logger()
+logger = get_logger(__name__)
+
+"""Mapa MATRICULA (PCEMPR) -> CODUSUR em memória, recarregado periodicamente. Substitui a
+subconsulta correlacionada de PCEMPR em sales_by_rca_fornec: a consulta recebe direto as
+matrículas cujo CODUSUR é o RCA pedido."""
+
+# Emitentes cujos pedidos contam para o CODUSUR do próprio pedido (CASE da consulta)
+EMITENTES_PROPRIO_RCA = (8888, 882, 883)
+
+
+def build_reverse_map(rows):
+    """[(matrícula, codusur)] -> {codusur: [matrículas]}, sem os EMITENTES_PROPRIO_RCA
+    (que nunca passam pela PCEMPR no CASE original)"""
+    reverse = {}
+    for matricula, codusur in rows:
+        if matricula in EMITENTES_PROPRIO_RCA or codusur is None:
+            continue
+        reverse.setdefault(codusur, []).append(matricula)
+    for matriculas in reverse.values():
+        matriculas.sort()
+    return reverse
+
+
+class EmitenteMap:
+    """Matrículas por CODUSUR, trocadas de uma vez a cada recarga.
+
+    `load()` é uma coroutine que retorna (colunas, [(matrícula, codusur)]) ou None.
+    """
+
+    def __init__(self, load, interval):
+        self.load = load
+        self._by_codusur = None
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.refresher = PeriodicTask("Mapa de emitentes", self.refresh, interval)
+
+    def loaded(self):
+        return self._by_codusur is not None
+
+    def matriculas(self, codusur):
+        """Matrículas cujo CODUSUR é `codusur`, ou None se o mapa ainda não foi carregado"""
+        if self._by_codusur is None:
+            return None
+        return self._by_codusur.get(codusur, [])
+
+    async def refresh(self):
+        result = await self.load()
+        if result is None:
+            self.refresh_errors += 1
+            logger.error("❌ Erro ao recarregar o mapa de emitentes (PCEMPR).")
+            return False
+        _, rows = result
+        self._by_codusur = build_reverse_map(rows)
+        self.refreshes += 1
+        logger.info(f"🔄 Mapa de emitentes: {len(rows)} matrículas.")
+        return True
+
+    def stats(self):
+        return {
+            "loaded": self.loaded(),
+            "codusur": len(self._by_codusur or {}),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+emitente_map = EmitenteMap(
+    lambda: oracle_db.execute_query_rows_async(queries.EMITENTES), Config.EMITENTE_MAP_REFRESH_INTERVAL)
@@ -1,49 +1,160 @@
 from logger.setup_logger import setup_logger, get_logger
-from connection.oracle_conn import OracleConnection
+from connection.oracle_conn import oracle_db
+from models.pagination import CURSOR_DATE_SQL, boundary_tie, complete_ties, keyset_query, paginate, tie_query
+from models.cache import cached
+from models.batching import chunked, group_by_key, in_list
+from models.emitentes import emitente_map
+from models.snapshot import price_snapshots
+from models.search import promo_index
+from models.day_cache import format_date, parse_date, sales_day_cache
+from models.ranges import merge_additive, range_budget, split_range
+from models import queries
+from environment.config import Config
+import asyncio
 
 # Configura o logger
 setup_logger()
 logger = get_logger(__name__)
 
-oracle_db = OracleConnection()
-
 
 class Model:
     """Classe base para modelos que interagem com o banco de dados Oracle"""
 
+    # Chaves (coluna, bind, texto) da paginação keyset de cada consulta. O EAN desempata os
+    # produtos com vários EANs; empates que restarem são completados por _keyset_page
+    ANSWER_TABLE_KEYS = (("CODPROD", "?", False), ("FAIXA_QTDE", "?", False), ("EAN", "?", True))
+    SALES_BY_SUPERV_KEYS = (("DATA", CURSOR_DATE_SQL, False), ("CODUSUR", "?", False))
+    PROMOS_KEYS = (("DESCRICAO", "?", True), ("CODPROD", "?", False))
+
+    # Junção dos sub-períodos de sales_by_rca_fornec: chaves do GROUP BY externo e métricas
+    # somadas (-> casas decimais). MIX e POSITIV são somas de contagens distintas por dia
+    # (ver VENDAS), então também são aditivas entre períodos disjuntos.
+    SALES_BY_RCA_FORNEC_MERGE = (
+        ("CODSUPERVISOR", "CODEMITENTEPED", "CODIGO", "META"),
+        {"VENDALIQ": 2, "UNIDS": None, "MIX": None, "POSITIV": None},
+    )
+
     @staticmethod
-    def try_connection():
-        """Executa uma consulta teste. Use para testar a conexão."""
+    async def _batch_lookup(statement, key_column, codes):
+        """Consulta vários códigos com IN (...) fatiados em BATCH_IN_CHUNK_SIZE binds.
 
-        query = """
-            SELECT DUMMY FROM DUAL
+        Retorna ({código: [linhas]}, [códigos não encontrados]) ou None em caso de erro.
         """
+        rows = []
+        for chunk in chunked(codes, Config.BATCH_IN_CHUNK_SIZE):
+            placeholders, params = in_list(chunk)
+            result = await oracle_db.execute_query_async(
+                statement.format(placeholders=placeholders), params)
+            if result is None:
+                return None
+            # As linhas podem ser compartilhadas (single-flight, cache): dicts novos sem a
+            # coluna auxiliar RN_LOTE, em vez de alterar os originais
+            rows.extend(
+                {column: value for column, value in row.items() if column != "RN_LOTE"} if "RN_LOTE" in row else row
+                for row in result)
+        return group_by_key(rows, key_column, codes)
+
+    @staticmethod
+    async def _keyset_page(statement, params, keys, limit, after=None):
+        """Executa uma página keyset da consulta e retorna (linhas, next_cursor)"""
+        query, page_params, variant = keyset_query(statement.sql, params, keys, limit, after)
+        result = await oracle_db.execute_query_async(statement.variant(variant, query), page_params)
+        tie = boundary_tie(result, keys, limit)
+        if tie is None:
+            return paginate(result, keys, limit)
+        # Chave repetida no fim da página: traz o grupo inteiro para não pular linhas
+        query, tie_params, variant = tie_query(statement.sql, params, keys, tie)
+        ties = await oracle_db.execute_query_async(statement.variant(variant, query), tie_params)
+        if ties is None:
+            return None, None
+        return complete_ties(result, keys, limit, ties)
+
+    @staticmethod
+    def _rca_fornec_query(codfornec, codemitente):
+        """(Statement, build_params(data1, data2)) de sales_by_rca_fornec: a versão com os
+        filtros dentro da CTE quando o mapa de emitentes está carregado, senão a original"""
+        matriculas = emitente_map.matriculas(codemitente)
+        if matriculas is None:
+            return queries.SALES_BY_RCA_FORNEC, lambda data1, data2: [data1, data2, codfornec, codemitente]
+        # Sem matrículas, IN (NULL) não casa com nenhum pedido
+        placeholders, params = in_list(matriculas or [None])
+        statement = queries.SALES_BY_RCA_FORNEC_PUSHDOWN.format(placeholders=placeholders)
+        return statement, lambda data1, data2: [
+            data1, data2, codfornec, codemitente, *params, codfornec, codemitente]
+
+    @staticmethod
+    def _parse_period(data1, data2):
+        """(date inicial, date final) de datas 'DD/MM/YYYY', ou None se alguma for inválida"""
         try:
-            dual = oracle_db.execute_query(query, params=None)
+            return parse_date(data1), parse_date(data2)
+        except ValueError:
+            return None
+
+    @staticmethod
+    async def _split_range_query(statement, build_params, start, end, merge=None):
+        """Executa uma consulta de período dividida em até RANGE_SPLIT_MAX_PARTS
+        sub-períodos concorrentes (cada um em uma conexão do pool) e junta os resultados.
+
+        `build_params(data1, data2)` monta os binds de um sub-período; `merge` é
+        (chaves, somas) para resultados agregados, ou None para só concatenar. As
+        sub-consultas entram no range_budget da requisição: no máximo RANGE_SPLIT_MAX_PARTS
+        ao mesmo tempo, mesmo somando várias faixas ou itens do /batch.
+        """
+        # Período invertido: uma consulta só, com as datas como vieram (o resultado é o
+        # da consulta original, ex.: as metas com totais zerados do LEFT JOIN)
+        ranges = split_range(start, end, Config.RANGE_SPLIT_DAYS, Config.RANGE_SPLIT_MAX_PARTS) or [(start, end)]
+
+        async def run(first, last):
+            async with budget:
+                return await oracle_db.execute_query_async(statement, build_params(format_date(first), format_date(last)))
+
+        with range_budget(Config.RANGE_SPLIT_MAX_PARTS) as budget:
+            results = await asyncio.gather(*(run(first, last) for first, last in ranges))
+        if any(result is None for result in results):
+            return None
+        if len(results) == 1:
+            return results[0]
+        if merge:
+            return merge_additive(results, *merge)
+        return [row for result in results for row in result]
+
+    @staticmethod
+    async def _sales_by_days(statement, code, data1, data2):
+        """Consulta de vendas por período montada a partir do cache por dia: só os dias
+        ausentes ou ainda abertos vão ao Oracle (ver models/day_cache.py)"""
+        async def load(start, end):
+            # Linhas por dia: sub-períodos são disjuntos e basta concatenar
+            return await Model._split_range_query(statement, lambda first, last: [code, first, last], start, end)
+
+        period = Model._parse_period(data1, data2)
+        if period is None:
+            # Data fora de DD/MM/YYYY: consulta direta (o Oracle valida a data)
+            return await oracle_db.execute_query_async(statement, [code, data1, data2])
+        if not Config.CACHE_ENABLED or period[0] > period[1]:
+            return await load(*period)
+        # Um único budget para todas as faixas ausentes do cache
+        with range_budget(Config.RANGE_SPLIT_MAX_PARTS):
+            return await sales_day_cache.get_range(
+                statement.name, code, *period, load, Config.RANGE_SPLIT_MAX_PARTS)
+
+    @staticmethod
+    async def try_connection():
+        """Executa uma consulta teste. Use para testar a conexão."""
+
+        try:
+            dual = await oracle_db.execute_query_async(queries.TRY_CONNECTION, params=None)
             return dual
         except Exception as e:
             logger.error(f"❌ Erro na conexão de teste: {e}", exc_info=True)
             return None
 
     @staticmethod
-    def query_info_client(codcli):
+    async def query_info_client(codcli):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-            SELECT
-                CODCLI, CNPJ, CLIENTE, CLASSE,
-                CASE
-                    WHEN UF = 'MG' THEN 1 ELSE 2
-                END AS CODFILIAL
-            FROM
-                FXIQVIACLI
-            WHERE
-                CODCLI = ?
-        """
 
         try:
-            result = oracle_db.execute_query(query, [codcli])
+            result = await oracle_db.execute_query_async(queries.INFO_CLIENT, [codcli])
             if not result:
                 logger.warning(
                     f"⚠️ Consulta sem resultados para codcli: {codcli}")
@@ -56,22 +167,21 @@ class Model:
             return None
 
     @staticmethod
-    def answer_table(codfilial):
-        """Executa uma consulta no banco e retorna informações"""
+    async def query_info_clients(codclis):
+        """Consulta vários clientes de uma vez. Retorna ({codcli: [linhas]}, [não encontrados])"""
+        try:
+            return await Model._batch_lookup(queries.INFO_CLIENTS, "CODCLI", codclis)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta em lote {e}", exc_info=True)
+            return None
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-            SELECT
-                EAN, DESCRICAO, CODPROD, CODFILIAL, ESTOQUE, FAIXA_QTDE,
-                PRECO_LIQ_SUGERIDO, PRECO_FIN_SUGERIDO, DOSAGEM, APRESENTACAO, PRINCIPATIVO
-            FROM
-                VW_FXIN_TAB_COT
-            WHERE
-                CODFILIAL = ?
-        """
+    @staticmethod
+    @cached("answer_table", Config.CACHE_TTL_ANSWER_TABLE, Config.CACHE_STALE_TTL)
+    async def answer_table(codfilial):
+        """Executa uma consulta no banco e retorna informações"""
 
         try:
-            result_cot = oracle_db.execute_query(query, [codfilial])
+            result_cot = await oracle_db.execute_query_async(queries.ANSWER_TABLE, [codfilial])
             if not result_cot:
                 logger.warning(f"⚠️ Tabela de preços atualizada.")
 
@@ -83,30 +193,48 @@ class Model:
             return None
 
     @staticmethod
-    def sales_by_rca_between_dates(codusur, data1, data2):
+    async def answer_table_page(codfilial, limit, after=None):
+        """Página da tabela de preços ordenada por CODPROD, FAIXA_QTDE, EAN"""
+        try:
+            return await Model._keyset_page(
+                queries.ANSWER_TABLE, [codfilial], Model.ANSWER_TABLE_KEYS, limit, after)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta paginada {e}", exc_info=True)
+            return None, None
+
+    @staticmethod
+    def answer_table_stream(codfilial, batch_size=None):
+        """Retorna a tabela de preços da filial em lotes (async iterator), sem materializar tudo"""
+        return oracle_db.execute_query_aiter(queries.ANSWER_TABLE, [codfilial], batch_size)
+
+    @staticmethod
+    @cached("answer_table_compact", Config.CACHE_TTL_ANSWER_TABLE, Config.CACHE_STALE_TTL)
+    async def answer_table_compact(codfilial):
+        """Tabela de preços no formato compacto: (colunas, linhas em tuplas)"""
+        try:
+            return await oracle_db.execute_query_rows_async(queries.ANSWER_TABLE, [codfilial])
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def answer_table_snapshot(codfilial):
+        """Snapshot em memória da tabela de preços da filial (None se a filial não está em
+        SNAPSHOT_FILIAIS ou ainda não foi carregada)"""
+        return price_snapshots.get(codfilial)
+
+    @staticmethod
+    def answer_table_columns(codfilial, batch_size=None):
+        """Tabela de preços da filial em lotes colunares (nomes, tipos, colunas)"""
+        return oracle_db.execute_query_columns_aiter(queries.ANSWER_TABLE, [codfilial], batch_size)
+
+    @staticmethod
+    async def sales_by_rca_between_dates(codusur, data1, data2):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-            SELECT
-                CODUSUR,
-                DATA,
-                SUM(FATURADO) AS FATURADO,
-                SUM(LIBERADO) AS LIBERADO,
-                SUM(BLOQUEADO) AS BLOQUEADO,
-                SUM("VENDA TOTAL") AS "VENDA TOTAL"
-            FROM
-                VW_FXIN_CB_VENDRCA
-            WHERE
-                CODUSUR = ?
-                AND TRUNC(DATA) BETWEEN TO_DATE(?, 'DD/MM/YYYY') AND TO_DATE(?, 'DD/MM/YYYY')
-            GROUP BY
-                CODUSUR,
-                DATA
-        """
 
         try:
-            result = oracle_db.execute_query(query, [codusur, data1, data2])
+            result = await Model._sales_by_days(queries.SALES_BY_RCA_BETWEEN_DATES, codusur, data1, data2)
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -118,30 +246,12 @@ class Model:
             return None
 
     @staticmethod
-    def sales_by_rca(codusur, data1):
+    async def sales_by_rca(codusur, data1):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-            SELECT
-                CODUSUR,
-                DATA,
-                SUM(FATURADO) AS FATURADO,
-                SUM(LIBERADO) AS LIBERADO,
-                SUM(BLOQUEADO) AS BLOQUEADO,
-                SUM("VENDA TOTAL") AS "VENDA TOTAL"
-            FROM
-                VW_FXIN_CB_VENDRCA
-            WHERE
-                CODUSUR = ?
-                AND TRUNC(DATA) = TO_DATE(?, 'DD/MM/YYYY')
-            GROUP BY
-                CODUSUR,
-                DATA
-        """
 
         try:
-            result = oracle_db.execute_query(query, [codusur, data1])
+            result = await oracle_db.execute_query_async(queries.SALES_BY_RCA, [codusur, data1])
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -153,23 +263,12 @@ class Model:
             return None
 
     @staticmethod
-    def sales_by_superv_between_dates(codsupervisor, data1, data2):
+    async def sales_by_superv_between_dates(codsupervisor, data1, data2):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-        SELECT
-            *
-        FROM
-            VW_FXIN_CB_VENDSUPERV
-        WHERE
-            CODSUPERVISOR = ?
-            AND DATA BETWEEN TO_DATE(?, 'DD/MM/YYYY') AND TO_DATE(?, 'DD/MM/YYYY')
-        """
-
         try:
-            result = oracle_db.execute_query(
-                query, [codsupervisor, data1, data2])
+            result = await Model._sales_by_days(
+                queries.SALES_BY_SUPERV_BETWEEN_DATES, codsupervisor, data1, data2)
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -181,22 +280,45 @@ class Model:
             return None
 
     @staticmethod
-    def sales_by_superv(codsupervisor, data1):
+    async def sales_by_superv_between_dates_page(codsupervisor, data1, data2, limit, after=None):
+        """Página das vendas do supervisor no período ordenada por DATA, CODUSUR"""
+        try:
+            return await Model._keyset_page(
+                queries.SALES_BY_SUPERV_BETWEEN_DATES, [codsupervisor, data1, data2],
+                Model.SALES_BY_SUPERV_KEYS, limit, after)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta paginada {e}", exc_info=True)
+            return None, None
+
+    @staticmethod
+    def sales_by_superv_between_dates_stream(codsupervisor, data1, data2, batch_size=None):
+        """Retorna as vendas do supervisor no período em lotes (async iterator)"""
+        return oracle_db.execute_query_aiter(
+            queries.SALES_BY_SUPERV_BETWEEN_DATES, [codsupervisor, data1, data2], batch_size)
+
+    @staticmethod
+    async def sales_by_superv_between_dates_compact(codsupervisor, data1, data2):
+        """Vendas do supervisor no período no formato compacto: (colunas, linhas em tuplas)"""
+        try:
+            return await oracle_db.execute_query_rows_async(
+                queries.SALES_BY_SUPERV_BETWEEN_DATES, [codsupervisor, data1, data2])
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def sales_by_superv_between_dates_columns(codsupervisor, data1, data2, batch_size=None):
+        """Vendas do supervisor no período em lotes colunares (nomes, tipos, colunas)"""
+        return oracle_db.execute_query_columns_aiter(
+            queries.SALES_BY_SUPERV_BETWEEN_DATES, [codsupervisor, data1, data2], batch_size)
+
+    @staticmethod
+    async def sales_by_superv(codsupervisor, data1):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = """
-        SELECT
-            *
-        FROM
-            VW_FXIN_CB_VENDSUPERV
-        WHERE
-            CODSUPERVISOR = ?
-            AND DATA = TO_DATE(?, 'DD/MM/YYYY')
-        """
 
         try:
-            result = oracle_db.execute_query(query, [codsupervisor, data1])
+            result = await oracle_db.execute_query_async(queries.SALES_BY_SUPERV, [codsupervisor, data1])
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -208,17 +330,12 @@ class Model:
             return None
 
     @staticmethod
-    def promos(codfilial, condicoes):
-        query = """
-            SELECT *
-            FROM VW_FXIN_CB_PROMOS
-            WHERE CODFILIAL = ?
-            AND LOWER(DESCRICAO) LIKE '%' || LOWER(?) || '%'
-        """
+    @cached("promos", Config.CACHE_TTL_PROMOS, Config.CACHE_STALE_TTL)
+    async def promos(codfilial, condicoes):
         params = [codfilial, condicoes]
 
         try:
-            result = oracle_db.execute_query(query, params)
+            result = await oracle_db.execute_query_async(queries.PROMOS, params)
             if not result:
                 logger.warning("⚠️ Nenhum dado encontrado.")
             return result if result else None
@@ -227,22 +344,33 @@ class Model:
             return None
 
     @staticmethod
-    def nf_xml_data(numnota):
+    def promos_index(codfilial):
+        """Índice de busca em memória das promoções da filial (None se a filial não está em
+        PROMO_INDEX_FILIAIS ou ainda não foi carregada)"""
+        return promo_index.get(codfilial)
+
+    @staticmethod
+    async def promos_page(codfilial, condicoes, limit, after=None):
+        """Página das promoções filtradas ordenada por DESCRICAO, CODPROD"""
+        try:
+            return await Model._keyset_page(
+                queries.PROMOS, [codfilial, condicoes], Model.PROMOS_KEYS, limit, after)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta paginada {e}", exc_info=True)
+            return None, None
+
+    @staticmethod
+    def promos_stream(codfilial, condicoes, batch_size=None):
+        """Retorna as promoções filtradas em lotes (async iterator)"""
+        return oracle_db.execute_query_aiter(queries.PROMOS, [codfilial, condicoes], batch_size)
+
+    @staticmethod
+    async def nf_xml_data(numnota):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = f"""
-            SELECT
-                *
-            FROM
-                VW_FXIN_XML_01
-            WHERE
-                ROWNUM = 1 AND
-                NUMNOTA = ?
-        """
 
         try:
-            result = oracle_db.execute_query(query, [numnota,])
+            result = await oracle_db.execute_query_async(queries.NF_XML_DATA, [numnota,])
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -254,30 +382,21 @@ class Model:
             return None
 
     @staticmethod
-    def boleto_data(numped):
+    async def nf_xml_data_batch(numnotas):
+        """Dados de XML de várias notas. Retorna ({numnota: [linha]}, [não encontradas])"""
+        try:
+            return await Model._batch_lookup(queries.NF_XML_DATA_BATCH, "NUMNOTA", numnotas)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta em lote {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    async def boleto_data(numped):
         """Executa uma consulta no banco e retorna informações"""
 
-        # Query SQL para extrair informações do banco de dados
-        query = f"""
-        SELECT
-            NUMNOTA,
-            NUMPED,
-            CODCLI,
-            CLIENTE,
-            NUMDOC,
-            VALOR,
-            DTVENC,
-            NOSSONUMBCO,
-            LINHADIG
-        FROM
-            VW_FXIN_CB_DADOSBOLETO
-        WHERE
-        ROWNUM = 1 AND
-        NUMNOTA = ?
-        """
 
         try:
-            result = oracle_db.execute_query(query, [numped,])
+            result = await oracle_db.execute_query_async(queries.BOLETO_DATA, [numped,])
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -289,86 +408,27 @@ class Model:
             return None
 
     @staticmethod
-    def sales_by_rca_fornec(codfornec, codemitente, data1, data2,):
+    async def boleto_data_batch(numnotas):
+        """Dados de boleto de várias notas. Retorna ({numnota: [linha]}, [não encontradas])"""
+        try:
+            return await Model._batch_lookup(queries.BOLETO_DATA_BATCH, "NUMNOTA", numnotas)
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar consulta em lote {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    async def sales_by_rca_fornec(codfornec, codemitente, data1, data2,):
         """Executa uma consulta no banco e retorna informações de vendas por emitente/fornecedor."""
 
-        query = f"""
-            WITH
-                VENDAS AS (
-                    SELECT
-                        A.DATA,
-                        B.CODUSUR,
-                        D.CODFORNEC,
-                        D.FORNECEDOR,
-                        CASE
-                            WHEN B.CODEMITENTE IN (8888, 882, 883)
-                            THEN B.CODUSUR
-                            ELSE (SELECT PCEMPR.CODUSUR FROM PCEMPR WHERE PCEMPR.MATRICULA = B.CODEMITENTE)
-                        END AS CODEMITENTEPED,
-                        ROUND(SUM((A.PVENDA - A.VLREPASSE) * A.QT),2) AS VENDALIQ,
-                        SUM(A.QT) AS UNIDS,
-                        COUNT (DISTINCT A.CODPROD) AS MIX,
-                        COUNT (DISTINCT B.CODCLI) AS POSITIV
-                    FROM
-                        PCPEDI A
-                        JOIN PCPEDC B ON A.NUMPED = B.NUMPED
-                        JOIN PCPRODUT C ON A.CODPROD = C.CODPROD
-                        JOIN PCFORNEC D ON C.CODFORNEC = D.CODFORNEC
-                    WHERE
-                        A.POSICAO IN ('F','L')
-                        AND A.QT > 0
-                        AND B.TIPOVENDA NOT IN ('5')
-                    GROUP BY
-                        A.DATA,
-                        B.CODUSUR,
-                        B.CODEMITENTE,
-                        D.CODFORNEC,
-                        D.FORNECEDOR
-                ),
-
-                METAS AS (
-                    SELECT
-                        E.DATA,
-                        E.CODIGO,
-                        E.CODUSUR,
-                        E.VLVENDAPREV AS META
-                    FROM
-                        PCMETA E
-                    WHERE
-                        E.TIPOMETA = 'FR'
-                )
-
-            SELECT
-                H.CODSUPERVISOR,
-                E.CODUSUR AS CODEMITENTEPED,
-                E.CODIGO,
-                E.META AS META,
-                NVL(SUM(G.VENDALIQ),0) AS VENDALIQ,
-                NVL(SUM(G.UNIDS),0) AS UNIDS,
-                NVL(SUM(G.MIX),0) AS MIX,
-                NVL(SUM(G.POSITIV),0) AS POSITIV
-            FROM
-                METAS E
-                JOIN PCUSUARI H ON E.CODUSUR = H.CODUSUR
-                LEFT JOIN VENDAS G
-                    ON E.CODUSUR = G.CODEMITENTEPED
-                    AND E.CODIGO = G.CODFORNEC
-                    AND G.DATA BETWEEN ? AND ?
-            WHERE
-                E.CODIGO = ?
-                AND E.CODUSUR = ?
-            GROUP BY
-                H.CODSUPERVISOR,
-                E.CODUSUR,
-                E.CODIGO,
-                E.META
-            ORDER BY
-                E.CODIGO
-        """
 
         try:
-            result = oracle_db.execute_query(
-                query, [data1, data2, codfornec, codemitente,])
+            statement, build_params = Model._rca_fornec_query(codfornec, codemitente)
+            period = Model._parse_period(data1, data2)
+            if period is None:
+                result = await oracle_db.execute_query_async(statement, build_params(data1, data2))
+            else:
+                result = await Model._split_range_query(
+                    statement, build_params, *period, Model.SALES_BY_RCA_FORNEC_MERGE)
             if not result:
                 logger.warning(f"⚠️ Nenhum dado encontrado.")
 
@@ -379,3 +439,20 @@ class Model:
             logger.error(
                 f"❌ Erro ao executar consulta de vendas por emitente/fornecedor {e}", exc_info=True)
             return None
+
+    @staticmethod
+    async def sales_by_rca_fornec_compact(codfornec, codemitente, data1, data2):
+        """Vendas por emitente/fornecedor no formato compacto: (colunas, linhas em tuplas)"""
+        try:
+            statement, build_params = Model._rca_fornec_query(codfornec, codemitente)
+            return await oracle_db.execute_query_rows_async(statement, build_params(data1, data2))
+        except Exception as e:
+            logger.error(
+                f"❌ Erro ao executar consulta de vendas por emitente/fornecedor {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def sales_by_rca_fornec_columns(codfornec, codemitente, data1, data2, batch_size=None):
+        """Vendas por emitente/fornecedor em lotes colunares (nomes, tipos, colunas)"""
+        statement, build_params = Model._rca_fornec_query(codfornec, codemitente)
+        return oracle_db.execute_query_columns_aiter(statement, build_params(data1, data2), batch_size)
@@ -0,0 +1,163 @@
+from datetime import datetime
+import base64
+import json
+
+"""Paginação keyset: em vez de OFFSET, cada página continua a partir da chave da última
+linha da página anterior (cursor opaco), usando o índice em vez de reler as linhas puladas.
+
+As chaves das views nem sempre são únicas: um grupo de linhas com a mesma chave nunca é
+dividido entre duas páginas (ver boundary_tie), então o `>` da página seguinte não pula
+linhas. Chaves nulas ficam no fim (NULLS LAST) e textos são comparados em binário."""
+
+# Formato usado para trafegar DATE/TIMESTAMP no cursor e no bind do predicado
+CURSOR_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CURSOR_DATE_SQL = "TO_DATE(?, 'YYYY-MM-DD HH24:MI:SS')"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+
+
+def encode_cursor(values):
+    """Gera o cursor opaco (base64url de um JSON) a partir dos valores das chaves"""
+    payload = [
+        {"$dt": value.strftime(CURSOR_DATE_FORMAT)} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decodifica o cursor opaco de volta para a lista de valores das chaves"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise ValueError("cursor não é uma lista")
+        return [
+            datetime.strptime(value["$dt"], CURSOR_DATE_FORMAT) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except Exception as e:
+        raise InvalidCursorError(f"Cursor inválido: {e}") from e
+
+
+def key_column(key):
+    """Expressão de ordenação/comparação da chave: texto com collation binária (NLSSORT)
+    nos dois lados, para o ORDER BY e o `>` concordarem com qualquer NLS_SORT da sessão"""
+    column, bind, text = key
+    if text:
+        return f"NLSSORT({column}, 'NLS_SORT=BINARY')", f"NLSSORT({bind}, 'NLS_SORT=BINARY')"
+    return column, bind
+
+
+def _equals(key, value, params):
+    """Predicado `coluna = valor` que também casa NULL com NULL"""
+    column, bind = key_column(key)
+    if value is None:
+        return f"{key[0]} IS NULL"
+    params.append(_bind_value(value))
+    return f"{column} = {bind}"
+
+
+def _greater(key, value, params):
+    """Predicado `coluna > valor` com NULLS LAST: NULL vem depois de qualquer valor e
+    nada vem depois de NULL (None)"""
+    column, bind = key_column(key)
+    if value is None:
+        return None
+    params.append(_bind_value(value))
+    return f"({column} > {bind} OR {key[0]} IS NULL)"
+
+
+def _null_mask(values):
+    return "".join("n" if value is None else "v" for value in values)
+
+
+def keyset_query(base_query, base_params, keys, limit, after=None):
+    """Envolve a query base com o predicado keyset, ORDER BY nas chaves e o limite.
+
+    `keys` é uma sequência de (coluna, expressão de bind, texto), ex.
+    ("DATA", CURSOR_DATE_SQL, False). Busca `limit + 1` linhas para saber se existe uma
+    próxima página. Retorna (query, parâmetros, nome da variação), já que a SQL muda
+    conforme as chaves nulas do cursor.
+    """
+    params = list(base_params)
+    where = ""
+    variant = "page"
+
+    if after is not None:
+        if len(after) != len(keys):
+            raise InvalidCursorError("Cursor não corresponde às chaves da consulta")
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        clauses = []
+        for i, key in enumerate(keys):
+            clause_params = []
+            parts = [_equals(prev, value, clause_params) for prev, value in zip(keys[:i], after[:i])]
+            greater = _greater(key, after[i], clause_params)
+            if greater is None:
+                continue
+            parts.append(greater)
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(clause_params)
+        # Cursor com todas as chaves nulas: não há nada depois dele
+        where = "WHERE " + (" OR ".join(clauses) if clauses else "1 = 0")
+        variant = f"page_after:{_null_mask(after)}"
+
+    order = ", ".join(f"{key_column(key)[0]} NULLS LAST" for key in keys)
+    query = f"""
+        SELECT * FROM (
+            SELECT * FROM ({base_query}) Q
+            {where}
+            ORDER BY {order}
+        ) WHERE ROWNUM <= ?
+    """
+    params.append(limit + 1)
+    return query, params, variant
+
+
+def tie_query(base_query, base_params, keys, values):
+    """Todas as linhas com exatamente a chave `values` (completa um grupo de empate que
+    ficou dividido no fim da página). Retorna (query, parâmetros, nome da variação)."""
+    params = list(base_params)
+    where = " AND ".join(_equals(key, value, params) for key, value in zip(keys, values))
+    query = f"SELECT * FROM ({base_query}) Q WHERE {where}"
+    return query, params, f"page_ties:{_null_mask(values)}"
+
+
+def row_key(row, keys):
+    return tuple(row[key[0]] for key in keys)
+
+
+def boundary_tie(rows, keys, limit):
+    """Chave do fim da página quando a linha seguinte tem a mesma chave (o `>` da próxima
+    página pularia as demais linhas do empate), senão None"""
+    if rows and len(rows) > limit:
+        last = row_key(rows[limit - 1], keys)
+        if row_key(rows[limit], keys) == last:
+            return last
+    return None
+
+
+def complete_ties(rows, keys, limit, ties):
+    """Página até o limite sem o grupo de empate do fim, seguida do grupo completo.
+    A página pode passar de `limit` linhas; o cursor é a chave do empate."""
+    boundary = row_key(rows[limit - 1], keys)
+    page = [row for row in rows[:limit] if row_key(row, keys) != boundary] + list(ties)
+    return page, encode_cursor(list(boundary))
+
+
+def paginate(rows, keys, limit):
+    """Corta as linhas no limite e gera o next_cursor (None quando é a última página)"""
+    rows = rows or []
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(list(row_key(page[-1], keys)))
+
+
+def _bind_value(value):
+    if isinstance(value, datetime):
+        return value.strftime(CURSOR_DATE_FORMAT)
+    return value
@@ -0,0 +1,343 @@
+from connection.statements import catalog
+
+"""Consultas da aplicação, registradas uma única vez no catálogo (connection/statements.py).
+
+Os métodos do Model executam estes Statements; consultas derivadas (páginas keyset e
+listas IN) são variações cacheadas do Statement base.
+
+fetch_size é o row prefetch de cada consulta: varreduras grandes trazem muitas linhas por
+ida ao banco, buscas pontuais trazem poucas."""
+
+TRY_CONNECTION = catalog.register("try_connection", """
+    SELECT DUMMY FROM DUAL
+""", fetch_size=1)
+
+INFO_CLIENT = catalog.register("query_info_client", """
+    SELECT
+        CODCLI, CNPJ, CLIENTE, CLASSE,
+        CASE
+            WHEN UF = 'MG' THEN 1 ELSE 2
+        END AS CODFILIAL
+    FROM
+        FXIQVIACLI
+    WHERE
+        CODCLI = ?
+""", params=("codcli",), fetch_size=10)
+
+# Consulta-modelo: {placeholders} recebe a lista de binds do IN (...)
+INFO_CLIENTS = catalog.register("query_info_clients", """
+    SELECT
+        CODCLI, CNPJ, CLIENTE, CLASSE,
+        CASE
+            WHEN UF = 'MG' THEN 1 ELSE 2
+        END AS CODFILIAL
+    FROM
+        FXIQVIACLI
+    WHERE
+        CODCLI IN ({placeholders})
+""", fetch_size=500, template=True)
+
+ANSWER_TABLE = catalog.register("answer_table", """
+    SELECT
+        EAN, DESCRICAO, CODPROD, CODFILIAL, ESTOQUE, FAIXA_QTDE,
+        PRECO_LIQ_SUGERIDO, PRECO_FIN_SUGERIDO, DOSAGEM, APRESENTACAO, PRINCIPATIVO
+    FROM
+        VW_FXIN_TAB_COT
+    WHERE
+        CODFILIAL = ?
+""", params=("codfilial",), fetch_size=1000)
+
+SALES_BY_RCA_BETWEEN_DATES = catalog.register("sales_by_rca_between_dates", """
+    SELECT
+        CODUSUR,
+        DATA,
+        SUM(FATURADO) AS FATURADO,
+        SUM(LIBERADO) AS LIBERADO,
+        SUM(BLOQUEADO) AS BLOQUEADO,
+        SUM("VENDA TOTAL") AS "VENDA TOTAL"
+    FROM
+        VW_FXIN_CB_VENDRCA
+    WHERE
+        CODUSUR = ?
+        AND TRUNC(DATA) BETWEEN TO_DATE(?, 'DD/MM/YYYY') AND TO_DATE(?, 'DD/MM/YYYY')
+    GROUP BY
+        CODUSUR,
+        DATA
+""", params=("codusur", "data1", "data2"), fetch_size=100)
+
+SALES_BY_RCA = catalog.register("sales_by_rca", """
+    SELECT
+        CODUSUR,
+        DATA,
+        SUM(FATURADO) AS FATURADO,
+        SUM(LIBERADO) AS LIBERADO,
+        SUM(BLOQUEADO) AS BLOQUEADO,
+        SUM("VENDA TOTAL") AS "VENDA TOTAL"
+    FROM
+        VW_FXIN_CB_VENDRCA
+    WHERE
+        CODUSUR = ?
+        AND TRUNC(DATA) = TO_DATE(?, 'DD/MM/YYYY')
+    GROUP BY
+        CODUSUR,
+        DATA
+""", params=("codusur", "data1"), fetch_size=10)
+
+SALES_BY_SUPERV_BETWEEN_DATES = catalog.register("sales_by_superv_between_dates", """
+    SELECT
+        *
+    FROM
+        VW_FXIN_CB_VENDSUPERV
+    WHERE
+        CODSUPERVISOR = ?
+        AND DATA BETWEEN TO_DATE(?, 'DD/MM/YYYY') AND TO_DATE(?, 'DD/MM/YYYY')
+""", params=("codsupervisor", "data1", "data2"), fetch_size=500)
+
+SALES_BY_SUPERV = catalog.register("sales_by_superv", """
+    SELECT
+        *
+    FROM
+        VW_FXIN_CB_VENDSUPERV
+    WHERE
+        CODSUPERVISOR = ?
+        AND DATA = TO_DATE(?, 'DD/MM/YYYY')
+""", params=("codsupervisor", "data1"), fetch_size=100)
+
+PROMOS = catalog.register("promos", """
+    SELECT *
+    FROM VW_FXIN_CB_PROMOS
+    WHERE CODFILIAL = ?
+    AND LOWER(DESCRICAO) LIKE '%' || LOWER(?) || '%'
+""", params=("codfilial", "condicoes"), fetch_size=200)
+
+# Promoções da filial inteira, para o índice de busca em memória (models/search.py)
+PROMOS_BY_FILIAL = catalog.register("promos_by_filial", """
+    SELECT *
+    FROM VW_FXIN_CB_PROMOS
+    WHERE CODFILIAL = ?
+""", params=("codfilial",), fetch_size=1000)
+
+NF_XML_DATA = catalog.register("nf_xml_data", """
+    SELECT
+        *
+    FROM
+        VW_FXIN_XML_01
+    WHERE
+        ROWNUM = 1 AND
+        NUMNOTA = ?
+""", params=("numnota",), fetch_size=10)
+
+# Consulta-modelo: {placeholders} recebe a lista de binds do IN (...)
+NF_XML_DATA_BATCH = catalog.register("nf_xml_data_batch", """
+    SELECT * FROM (
+        SELECT
+            V.*,
+            ROW_NUMBER() OVER (PARTITION BY V.NUMNOTA ORDER BY NULL) AS RN_LOTE
+        FROM
+            VW_FXIN_XML_01 V
+        WHERE
+            V.NUMNOTA IN ({placeholders})
+    ) WHERE RN_LOTE = 1
+""", fetch_size=500, template=True)
+
+BOLETO_DATA = catalog.register("boleto_data", """
+    SELECT
+        NUMNOTA,
+        NUMPED,
+        CODCLI,
+        CLIENTE,
+        NUMDOC,
+        VALOR,
+        DTVENC,
+        NOSSONUMBCO,
+        LINHADIG
+    FROM
+        VW_FXIN_CB_DADOSBOLETO
+    WHERE
+    ROWNUM = 1 AND
+    NUMNOTA = ?
+""", params=("numnota",), fetch_size=10)
+
+# Consulta-modelo: {placeholders} recebe a lista de binds do IN (...)
+BOLETO_DATA_BATCH = catalog.register("boleto_data_batch", """
+    SELECT
+        NUMNOTA, NUMPED, CODCLI, CLIENTE, NUMDOC, VALOR, DTVENC, NOSSONUMBCO, LINHADIG
+    FROM (
+        SELECT
+            NUMNOTA,
+            NUMPED,
+            CODCLI,
+            CLIENTE,
+            NUMDOC,
+            VALOR,
+            DTVENC,
+            NOSSONUMBCO,
+            LINHADIG,
+            ROW_NUMBER() OVER (PARTITION BY NUMNOTA ORDER BY NULL) AS RN_LOTE
+        FROM
+            VW_FXIN_CB_DADOSBOLETO
+        WHERE
+            NUMNOTA IN ({placeholders})
+    ) WHERE RN_LOTE = 1
+""", fetch_size=500, template=True)
+
+SALES_BY_RCA_FORNEC = catalog.register("sales_by_rca_fornec", """
+    WITH
+        VENDAS AS (
+            SELECT
+                A.DATA,
+                B.CODUSUR,
+                D.CODFORNEC,
+                D.FORNECEDOR,
+                CASE
+                    WHEN B.CODEMITENTE IN (8888, 882, 883)
+                    THEN B.CODUSUR
+                    ELSE (SELECT PCEMPR.CODUSUR FROM PCEMPR WHERE PCEMPR.MATRICULA = B.CODEMITENTE)
+                END AS CODEMITENTEPED,
+                ROUND(SUM((A.PVENDA - A.VLREPASSE) * A.QT),2) AS VENDALIQ,
+                SUM(A.QT) AS UNIDS,
+                COUNT (DISTINCT A.CODPROD) AS MIX,
+                COUNT (DISTINCT B.CODCLI) AS POSITIV
+            FROM
+                PCPEDI A
+                JOIN PCPEDC B ON A.NUMPED = B.NUMPED
+                JOIN PCPRODUT C ON A.CODPROD = C.CODPROD
+                JOIN PCFORNEC D ON C.CODFORNEC = D.CODFORNEC
+            WHERE
+                A.POSICAO IN ('F','L')
+                AND A.QT > 0
+                AND B.TIPOVENDA NOT IN ('5')
+            GROUP BY
+                A.DATA,
+                B.CODUSUR,
+                B.CODEMITENTE,
+                D.CODFORNEC,
+                D.FORNECEDOR
+        ),
+
+        METAS AS (
+            SELECT
+                E.DATA,
+                E.CODIGO,
+                E.CODUSUR,
+                E.VLVENDAPREV AS META
+            FROM
+                PCMETA E
+            WHERE
+                E.TIPOMETA = 'FR'
+        )
+
+    SELECT
+        H.CODSUPERVISOR,
+        E.CODUSUR AS CODEMITENTEPED,
+        E.CODIGO,
+        E.META AS META,
+        NVL(SUM(G.VENDALIQ),0) AS VENDALIQ,
+        NVL(SUM(G.UNIDS),0) AS UNIDS,
+        NVL(SUM(G.MIX),0) AS MIX,
+        NVL(SUM(G.POSITIV),0) AS POSITIV
+    FROM
+        METAS E
+        JOIN PCUSUARI H ON E.CODUSUR = H.CODUSUR
+        LEFT JOIN VENDAS G
+            ON E.CODUSUR = G.CODEMITENTEPED
+            AND E.CODIGO = G.CODFORNEC
+            AND G.DATA BETWEEN ? AND ?
+    WHERE
+        E.CODIGO = ?
+        AND E.CODUSUR = ?
+    GROUP BY
+        H.CODSUPERVISOR,
+        E.CODUSUR,
+        E.CODIGO,
+        E.META
+    ORDER BY
+        E.CODIGO
+""", params=("data1", "data2", "codfornec", "codemitente"), fetch_size=50)
+
+# Mesma consulta de SALES_BY_RCA_FORNEC com os filtros dentro da CTE VENDAS: período,
+# fornecedor e emitente entram antes do GROUP BY, em vez de agregar todo o histórico. O
+# CASE/subconsulta de PCEMPR vira um filtro: pedidos de emitentes 8888/882/883 contam para o
+# próprio CODUSUR do pedido; os demais, para o CODUSUR da matrícula do emitente, então
+# {placeholders} recebe as matrículas cujo CODUSUR é o RCA pedido (mapa em
+# models/emitentes.py). O GROUP BY da CTE é o mesmo, para MIX e POSITIV não mudarem.
+SALES_BY_RCA_FORNEC_PUSHDOWN = catalog.register("sales_by_rca_fornec_pushdown", """
+    WITH
+        VENDAS AS (
+            SELECT
+                A.DATA,
+                D.CODFORNEC,
+                ROUND(SUM((A.PVENDA - A.VLREPASSE) * A.QT),2) AS VENDALIQ,
+                SUM(A.QT) AS UNIDS,
+                COUNT (DISTINCT A.CODPROD) AS MIX,
+                COUNT (DISTINCT B.CODCLI) AS POSITIV
+            FROM
+                PCPEDI A
+                JOIN PCPEDC B ON A.NUMPED = B.NUMPED
+                JOIN PCPRODUT C ON A.CODPROD = C.CODPROD
+                JOIN PCFORNEC D ON C.CODFORNEC = D.CODFORNEC
+            WHERE
+                A.POSICAO IN ('F','L')
+                AND A.QT > 0
+                AND B.TIPOVENDA NOT IN ('5')
+                AND A.DATA BETWEEN ? AND ?
+                AND C.CODFORNEC = ?
+                AND (
+                    (B.CODEMITENTE IN (8888, 882, 883) AND B.CODUSUR = ?)
+                    OR B.CODEMITENTE IN ({placeholders})
+                )
+            GROUP BY
+                A.DATA,
+                B.CODUSUR,
+                B.CODEMITENTE,
+                D.CODFORNEC,
+                D.FORNECEDOR
+        ),
+
+        METAS AS (
+            SELECT
+                E.DATA,
+                E.CODIGO,
+                E.CODUSUR,
+                E.VLVENDAPREV AS META
+            FROM
+                PCMETA E
+            WHERE
+                E.TIPOMETA = 'FR'
+        )
+
+    SELECT
+        H.CODSUPERVISOR,
+        E.CODUSUR AS CODEMITENTEPED,
+        E.CODIGO,
+        E.META AS META,
+        NVL(SUM(G.VENDALIQ),0) AS VENDALIQ,
+        NVL(SUM(G.UNIDS),0) AS UNIDS,
+        NVL(SUM(G.MIX),0) AS MIX,
+        NVL(SUM(G.POSITIV),0) AS POSITIV
+    FROM
+        METAS E
+        JOIN PCUSUARI H ON E.CODUSUR = H.CODUSUR
+        LEFT JOIN VENDAS G
+            ON E.CODIGO = G.CODFORNEC
+    WHERE
+        E.CODIGO = ?
+        AND E.CODUSUR = ?
+    GROUP BY
+        H.CODSUPERVISOR,
+        E.CODUSUR,
+        E.CODIGO,
+        E.META
+    ORDER BY
+        E.CODIGO
+""", fetch_size=50, template=True)
+
+EMITENTES = catalog.register("emitentes", """
+    SELECT
+        MATRICULA,
+        CODUSUR
+    FROM
+        PCEMPR
+    WHERE
+        CODUSUR IS NOT NULL
+""", fetch_size=1000)
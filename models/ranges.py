@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+import asyncio
+
+"""Divisão de períodos longos em sub-períodos executados em paralelo e junção dos
+resultados parciais."""
+
+# Semáforo das sub-consultas de período da requisição atual (ver range_budget)
+_budget = ContextVar("range_budget", default=None)
+
+
+@contextmanager
+def range_budget(max_parts):
+    """Limita a `max_parts` as sub-consultas de período simultâneas de toda a requisição,
+    somando todas as faixas e todos os sub-períodos. Dentro de um range_budget já aberto
+    (ex.: os itens do /batch), devolve o mesmo semáforo."""
+    budget = _budget.get()
+    if budget is not None:
+        yield budget
+        return
+    budget = asyncio.Semaphore(max_parts)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def split_range(start, end, chunk_days, max_parts):
+    """Divide [start, end] (dates, inclusivo) em faixas contíguas de até `chunk_days` dias.
+
+    Com mais de `max_parts` faixas, as faixas crescem para que o total seja `max_parts`.
+    """
+    total = (end - start).days + 1
+    if total <= 0:
+        return []
+    parts = max(1, min(max_parts, -(-total // chunk_days)))
+    size = -(-total // parts)
+    ranges = []
+    first = start
+    while first <= end:
+        last = min(end, first + timedelta(days=size - 1))
+        ranges.append((first, last))
+        first = last + timedelta(days=1)
+    return ranges
+
+
+def merge_additive(parts, keys, sums):
+    """Junta resultados parciais agrupados por `keys`, somando as colunas de `sums`.
+
+    `sums` mapeia coluna -> casas decimais do arredondamento final (None = sem arredondar).
+    Só vale para métricas aditivas entre períodos disjuntos: somas e contagens por dia. Um
+    COUNT(DISTINCT ...) sobre o período inteiro não pode ser dividido.
+    """
+    merged = {}
+    for rows in parts:
+        for row in rows:
+            key = tuple(row[column] for column in keys)
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(row)
+                continue
+            for column in sums:
+                current[column] = (current[column] or 0) + (row[column] or 0)
+    for row in merged.values():
+        for column, digits in sums.items():
+            if digits is not None and row[column] is not None:
+                row[column] = round(row[column], digits)
+    return list(merged.values())
@@ -0,0 +1,49 @@
+from logger.setup_logger import setup_logger, get_logger
+import asyncio
+
+setup_logger()
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """Executa a coroutine `func()` a cada `interval` segundos em segundo plano.
+
+    A primeira execução acontece logo no start(). Erros são registrados e a tarefa
+    continua no próximo intervalo.
+    """
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.errors = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🔵 Tarefa periódica '{self.name}' iniciada (a cada {self.interval:g} s).")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.func()
+                self.runs += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Erro na tarefa periódica '{self.name}': {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from environment.config import Config
+from models import queries
+from models.snapshot import SnapshotStore
+import unicodedata
+
+"""Busca de promoções em memória: índice de trigramas sobre DESCRICAO, normalizada sem
+acentos e em minúsculas. Cada termo da busca precisa aparecer como substring da descrição
+(como o LIKE '%...%' da consulta original); os trigramas só reduzem os candidatos antes
+da verificação."""
+
+NGRAM = 3
+
+
+def normalize(text):
+    """Minúsculas, sem acentos e com espaços simples"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def ngrams(text):
+    return {text[index:index + NGRAM] for index in range(len(text) - NGRAM + 1)}
+
+
+class TrigramIndex:
+    """Índice trigrama -> {posições} sobre uma lista de textos já normalizados"""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.postings = {}
+        for position, text in enumerate(texts):
+            for gram in ngrams(text):
+                self.postings.setdefault(gram, set()).add(position)
+
+    def candidates(self, term):
+        """Posições que podem conter `term` (todas, se o termo for menor que um trigrama)"""
+        grams = ngrams(term)
+        if not grams:
+            return None
+        sets = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def search(self, query):
+        """Posições cujo texto contém todos os termos de `query` (normalizada)"""
+        terms = query.split()
+        if not terms:
+            return list(range(len(self.texts)))
+        positions = None
+        for term in sorted(terms, key=len, reverse=True):
+            found = self.candidates(term)
+            if found is not None:
+                positions = found if positions is None else positions & found
+        if positions is None:
+            positions = range(len(self.texts))
+        return [position for position in positions
+                if all(term in self.texts[position] for term in terms)]
+
+
+def _rank(text, query, terms):
+    """Ordenação: frase inteira, começo da descrição, termos no início de palavras,
+    posição da primeira ocorrência e descrição mais curta"""
+    padded = " " + text
+    return (
+        query not in text,
+        not text.startswith(terms[0]),
+        -sum((" " + term) in padded for term in terms),
+        text.find(terms[0]),
+        len(text),
+    )
+
+
+class PromoSearchIndex:
+    """Promoções de uma filial com índice de trigramas sobre DESCRICAO"""
+
+    def __init__(self, codfilial, columns, rows):
+        self.codfilial = codfilial
+        self.columns = columns
+        self.rows = rows
+        self.loaded_at = datetime.now()
+        column = columns.index("DESCRICAO")
+        self.index = TrigramIndex([normalize(row[column]) for row in rows])
+
+    def search(self, text, top=None):
+        """Promoções cuja descrição contém todos os termos de `text`, ordenadas por
+        relevância e limitadas a `top` resultados"""
+        query = normalize(text)
+        positions = self.index.search(query)
+        terms = query.split()
+        texts = self.index.texts
+        if terms:
+            positions.sort(key=lambda position: (_rank(texts[position], query, terms), position))
+        else:
+            positions.sort(key=lambda position: texts[position])
+        if top is not None:
+            positions = positions[:top]
+        return [dict(zip(self.columns, self.rows[position])) for position in positions]
+
+    def stats(self):
+        return {
+            "rows": len(self.rows),
+            "trigrams": len(self.index.postings),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+promo_index = SnapshotStore(
+    "Índice de promoções", Config.PROMO_INDEX_FILIAIS, queries.PROMOS_BY_FILIAL,
+    PromoSearchIndex, Config.PROMO_INDEX_REFRESH_INTERVAL)
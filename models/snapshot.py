@@ -0,0 +1,141 @@
+from connection.oracle_conn import oracle_db
+from datetime import datetime
+from environment.config import Config
+from logger.setup_logger import setup_logger, get_logger
+from models import queries
+from models.scheduler import PeriodicTask
+import asyncio
+import time
+
+setup_logger()
+logger = get_logger(__name__)
+
+"""Snapshots em memória de consultas de referência (tabela de preços e índice de promoções
+por filial, mapa de emitentes). Cada snapshot é recarregado periodicamente e trocado de uma
+vez (a referência passa a apontar para o novo objeto), então as consultas nunca veem um
+índice pela metade e não vão ao Oracle."""
+
+
+def _ean_key(value):
+    return str(value).strip()
+
+
+def _text_key(value):
+    return " ".join(str(value).upper().split())
+
+
+class PriceTableSnapshot:
+    """Tabela de preços de uma filial: linhas em tuplas e índices {chave: [linhas]}"""
+
+    def __init__(self, codfilial, columns, rows):
+        self.codfilial = codfilial
+        self.columns = columns
+        self.rows = rows
+        self.loaded_at = datetime.now()
+        position = {name: index for index, name in enumerate(columns)}
+        self.by_ean = self._index(position["EAN"], _ean_key)
+        self.by_codprod = self._index(position["CODPROD"], int)
+        self.by_principativo = self._index(position["PRINCIPATIVO"], _text_key)
+
+    def _index(self, column, key):
+        index = {}
+        for row in self.rows:
+            value = row[column]
+            if value is not None:
+                index.setdefault(key(value), []).append(row)
+        return index
+
+    def as_dicts(self, rows):
+        return [dict(zip(self.columns, row)) for row in rows]
+
+    def find_ean(self, ean):
+        return self.as_dicts(self.by_ean.get(_ean_key(ean), ()))
+
+    def find_codprod(self, codprod):
+        return self.as_dicts(self.by_codprod.get(codprod, ()))
+
+    def find_principativo(self, principativo):
+        return self.as_dicts(self.by_principativo.get(_text_key(principativo), ()))
+
+    def find_eans(self, eans):
+        """Retorna ({ean: [linhas]}, [EANs não encontrados])"""
+        found = {}
+        missing = []
+        for ean in eans:
+            rows = self.by_ean.get(_ean_key(ean))
+            if rows:
+                found[ean] = self.as_dicts(rows)
+            else:
+                missing.append(ean)
+        return found, missing
+
+    def stats(self):
+        return {
+            "rows": len(self.rows),
+            "eans": len(self.by_ean),
+            "products": len(self.by_codprod),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+class SnapshotStore:
+    """Snapshots das filiais configuradas de uma consulta por filial.
+
+    `build(codfilial, colunas, linhas)` monta o snapshot (com stats()); o `refresher`
+    recarrega todas as filiais a cada `interval` segundos.
+    """
+
+    def __init__(self, name, filiais, statement, build, interval):
+        self.name = name
+        self.filiais = filiais
+        self.statement = statement
+        self.build = build
+        self._snapshots = {}
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_refresh_seconds = None
+        self.refresher = PeriodicTask(name, self.refresh_all, interval)
+
+    def get(self, codfilial):
+        return self._snapshots.get(codfilial)
+
+    async def refresh(self, codfilial):
+        """Recarrega a filial do Oracle e troca o snapshot. Em caso de erro (ou resultado
+        vazio) o snapshot anterior continua valendo."""
+        started = time.perf_counter()
+        result = await oracle_db.execute_query_rows_async(self.statement, [codfilial])
+        if result is None:
+            self.refresh_errors += 1
+            logger.error(f"❌ Erro ao recarregar {self.name} da filial {codfilial}.")
+            return False
+        columns, rows = result
+        if not rows and codfilial in self._snapshots:
+            logger.warning(f"⚠️ Consulta de {self.name} da filial {codfilial} vazia; snapshot anterior mantido.")
+            return False
+
+        # Índices montados fora do event loop e fora das threads do banco
+        snapshot = await asyncio.to_thread(self.build, codfilial, columns, rows)
+        self._snapshots[codfilial] = snapshot
+        self.refreshes += 1
+        self.last_refresh_seconds = time.perf_counter() - started
+        logger.info(f"🔄 {self.name} da filial {codfilial}: {len(rows)} linhas "
+                    f"em {self.last_refresh_seconds:.2f} s.")
+        return True
+
+    async def refresh_all(self):
+        for codfilial in self.filiais:
+            await self.refresh(codfilial)
+
+    def stats(self):
+        return {
+            "filiais": self.filiais,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "last_refresh_seconds": self.last_refresh_seconds,
+            "snapshots": {codfilial: snapshot.stats() for codfilial, snapshot in self._snapshots.items()},
+        }
+
+
+price_snapshots = SnapshotStore(
+    "Snapshot da tabela de preços", Config.SNAPSHOT_FILIAIS, queries.ANSWER_TABLE,
+    PriceTableSnapshot, Config.SNAPSHOT_REFRESH_INTERVAL)
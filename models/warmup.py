@@ -0,0 +1,85 @@
+from logger.setup_logger import setup_logger, get_logger
+import asyncio
+import time
+
+setup_logger()
+logger = get_logger(__name__)
+
+"""Warm-up da aplicação: a inicialização pesada (JVM, conexões do pool, hash das senhas,
+consulta teste) roda em segundo plano depois que o servidor sobe, e não no import. O
+worker já responde /health/live enquanto isso; /health/ready só responde 200 depois que
+todas as etapas terminaram sem erro."""
+
+
+class WarmUp:
+    """Executa em ordem as etapas [(nome, coroutine)] e guarda o tempo de cada uma.
+
+    Uma etapa falha se levanta exceção ou retorna None/False. Depois de uma falha, o
+    próximo check() roda o warm-up de novo (as etapas já feitas são baratas).
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.ready = False
+        self.error = None
+        self.timings = {}
+        self.runs = 0
+        self._task = None
+
+    def start(self):
+        """Dispara o warm-up em segundo plano (não espera)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def cancel(self):
+        """Interrompe o warm-up em andamento (encerramento do worker)"""
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def run(self):
+        self.runs += 1
+        self.error = None
+        started = time.perf_counter()
+        for name, step in self.steps:
+            step_started = time.perf_counter()
+            try:
+                result = await step()
+            except Exception as e:
+                result = None
+                self.error = f"{name}: {e}"
+            self.timings[name] = round(time.perf_counter() - step_started, 3)
+            if result is None or result is False:
+                self.error = self.error or f"{name}: falhou"
+                logger.error(f"❌ Warm-up interrompido na etapa '{name}': {self.error}")
+                return False
+        self.ready = True
+        self.error = None
+        logger.info(f"✅ Warm-up concluído em {time.perf_counter() - started:.2f} s: {self.timings}")
+        return True
+
+    async def wait(self):
+        """Espera o warm-up em andamento (se houver) e retorna se está pronto"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+        return self.ready
+
+    def check(self):
+        """Pronto? Se o último warm-up falhou, dispara outro em segundo plano"""
+        if not self.ready and self._task is not None and self._task.done():
+            self.start()
+        return self.ready
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "running": self._task is not None and not self._task.done(),
+            "runs": self.runs,
+            "error": self.error,
+            "timings": self.timings,
+        }
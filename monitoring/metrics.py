@@ -0,0 +1,195 @@
+from bisect import bisect_left
+from environment.config import Config
+import threading
+import time
+
+"""Métricas em memória no formato texto do Prometheus (GET /metrics).
+
+Cada métrica guarda seus valores por tupla de labels em um dict. Registrar uma observação
+custa uma busca no dict, um bisect nos buckets e um lock curto (as consultas rodam nas
+threads do executor do banco). Gauges são lidos por callback só na hora da coleta."""
+
+# Buckets (segundos) das latências de requisições e de consultas
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> [contagem por bucket (+Inf no fim), soma, total]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._values.items()}
+        for labels, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labels, labels)} {count}"
+
+
+class Gauge:
+    """Valor lido na coleta: `collect()` retorna {labels: valor}"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels, collect):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in sorted(self.collect().items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class CallbackCounter(Gauge):
+    """Contador mantido por outro objeto, lido na coleta como o Gauge"""
+
+    kind = "counter"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (0.0.4)"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições por rota", ("method", "route", "status")))
+http_response_bytes = registry.register(Counter(
+    "http_response_bytes_total", "Bytes enviados no corpo das respostas por rota", ("method", "route")))
+db_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Espera para obter uma conexão do pool"))
+db_query_duration = registry.register(Histogram(
+    "db_query_phase_seconds", "Tempo por consulta do catálogo e fase (execute, fetch, convert)", ("query", "phase")))
+db_query_rows = registry.register(Counter(
+    "db_query_rows_total", "Linhas devolvidas por consulta do catálogo", ("query",)))
+db_query_errors = registry.register(Counter(
+    "db_query_errors_total", "Consultas que terminaram com erro", ("query",)))
+
+
+def register_pool(pool_stats):
+    """Gauges de conexões em uso/ociosas e de threads esperando, lidos de `pool_stats()`"""
+    def connections():
+        stats = pool_stats()
+        return {("in_use",): stats["in_use"], ("idle",): stats["idle"]}
+
+    registry.register(Gauge("db_pool_connections", "Conexões do pool por estado", ("state",), connections))
+    registry.register(Gauge("db_pool_waiters", "Threads esperando uma conexão do pool", (),
+                            lambda: {(): pool_stats()["waiters"]}))
+
+
+def register_single_flight(single_flight_stats):
+    """Contadores do single-flight do banco, lidos de `single_flight_stats()`"""
+    registry.register(CallbackCounter(
+        "db_single_flight_calls_total", "Consultas assíncronas por resultado do single-flight", ("result",),
+        lambda: {(name,): single_flight_stats()[name] for name in ("executions", "coalesced")}))
+    registry.register(Gauge("db_single_flight_in_flight", "Execuções compartilháveis em andamento", (),
+                            lambda: {(): single_flight_stats()["in_flight"]}))
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência e bytes do corpo por rota (o template, ex.:
+    /info/client/{codcli}, e não a URL), inclusive em respostas em streaming"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not Config.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+        sent = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                sent[0] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "(sem rota)"
+            method = scope["method"]
+            http_request_duration.observe((method, path, str(status[0])), time.perf_counter() - started)
+            http_response_bytes.inc((method, path), sent[0])
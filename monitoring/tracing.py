@@ -0,0 +1,236 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from environment.config import Config
+from logger.setup_logger import setup_logger, get_logger
+import random
+import re
+import threading
+import time
+import uuid
+
+setup_logger()
+logger = get_logger(__name__)
+
+"""Tracing por requisição (opcional) e log de consultas lentas.
+
+O trace da requisição fica em um ContextVar: as fases registradas em qualquer ponto do
+caminho (espera do pool, execute, fetch, conversão, serialização) entram no trace atual,
+inclusive nas threads do executor do banco (OracleConnection.run_async copia o contexto).
+Sem trace ativo, registrar uma fase custa só a leitura do ContextVar."""
+
+TRACE_HEADER = "x-trace-id"
+TRACE_OPT_IN_HEADER = "x-trace"
+VALID_TRACE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# Parâmetros descritos por consulta lenta (listas IN podem ter centenas)
+SLOW_QUERY_MAX_PARAMS = 20
+
+_current = ContextVar("trace", default=None)
+
+
+class Trace:
+    """Fases (spans) de uma requisição: [(nome, início relativo, duração, atributos)]"""
+
+    def __init__(self, trace_id, name):
+        self.trace_id = trace_id
+        self.name = name
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.duration = None
+        self.status = None
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration, attrs):
+        with self._lock:
+            self.spans.append((name, start - self.origin, duration, attrs))
+
+    def totals(self):
+        """Duração somada por nome de fase, na ordem da primeira ocorrência"""
+        totals = {}
+        with self._lock:
+            for name, _, duration, _ in self.spans:
+                totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def server_timing(self):
+        """Header Server-Timing (ms) com o total de cada fase"""
+        return ", ".join(f"{name};dur={duration * 1000:.2f}" for name, duration in self.totals().items())
+
+    def as_dict(self):
+        with self._lock:
+            spans = [
+                {"name": name, "start_ms": round(start * 1000, 3), "duration_ms": round(duration * 1000, 3), **attrs}
+                for name, start, duration, attrs in self.spans
+            ]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "spans": spans,
+        }
+
+
+def current():
+    return _current.get()
+
+
+def record(name, start, duration, **attrs):
+    """Registra uma fase já medida (início em perf_counter) no trace atual, se houver"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, start, duration, attrs)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Mede o bloco como uma fase do trace atual (não faz nada sem trace)"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start, attrs)
+
+
+recent_traces = deque(maxlen=Config.TRACE_BUFFER_SIZE)
+
+
+def find_trace(trace_id):
+    for trace in reversed(recent_traces):
+        if trace.trace_id == trace_id:
+            return trace
+    return None
+
+
+def _header(scope, name):
+    for key, value in scope["headers"]:
+        if key == name.encode():
+            return value.decode("latin-1")
+    return None
+
+
+def _should_trace(scope):
+    """Trace quando pedido (X-Trace: 1 ou X-Trace-Id) ou por amostragem (TRACE_SAMPLE_RATE)"""
+    trace_id = _header(scope, TRACE_HEADER)
+    if trace_id is not None and VALID_TRACE_ID.match(trace_id):
+        return trace_id
+    if _header(scope, TRACE_OPT_IN_HEADER) in ("1", "true"):
+        return uuid.uuid4().hex
+    if Config.TRACE_SAMPLE_RATE > 0 and random.random() < Config.TRACE_SAMPLE_RATE:
+        return uuid.uuid4().hex
+    return None
+
+
+class TracingMiddleware:
+    """Middleware ASGI: abre o trace da requisição e devolve X-Trace-Id e Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not Config.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        trace_id = _should_trace(scope)
+        if trace_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id, f"{scope['method']} {scope['path']}")
+        token = _current.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                elapsed = time.perf_counter() - trace.origin
+                timing = trace.server_timing()
+                timing = f"{timing}, total;dur={elapsed * 1000:.2f}" if timing else f"total;dur={elapsed * 1000:.2f}"
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", trace_id.encode()))
+                headers.append((b"server-timing", timing.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                trace.name = f"{scope['method']} {route.path}"
+            trace.duration = time.perf_counter() - trace.origin
+            recent_traces.append(trace)
+
+
+def normalize_sql(sql):
+    """SQL em uma linha, com listas longas de binds (IN ...) resumidas"""
+    sql = " ".join(sql.split())
+    return re.sub(r"\?(?:\s*,\s*\?){3,}", lambda match: f"?, ... ({match.group(0).count('?')} binds)", sql)
+
+
+def param_shape(value):
+    """Tipo (e tamanho de textos) de um parâmetro, sem o valor"""
+    if value is None:
+        return "None"
+    if isinstance(value, str):
+        return f"str({len(value)})"
+    return type(value).__name__
+
+
+class SlowQueryLog:
+    """Últimas consultas acima de SLOW_QUERY_THRESHOLD segundos, amostradas por
+    SLOW_QUERY_SAMPLE_RATE: SQL normalizada, formato dos parâmetros e tempo por fase"""
+
+    def __init__(self, threshold, sample_rate, size):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.entries = deque(maxlen=size)
+        self.slow = 0
+        self.logged = 0
+
+    def check(self, statement, params, phases, rows):
+        """Chamado ao fim de cada consulta com {fase: segundos}"""
+        total = sum(phases.values())
+        if self.threshold <= 0 or total < self.threshold:
+            return
+        self.slow += 1
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        self.logged += 1
+        trace = _current.get()
+        params = list(params or ())
+        shapes = [param_shape(value) for value in params[:SLOW_QUERY_MAX_PARAMS]]
+        if len(params) > SLOW_QUERY_MAX_PARAMS:
+            shapes.append(f"... (+{len(params) - SLOW_QUERY_MAX_PARAMS})")
+        entry = {
+            "at": datetime.now().isoformat(),
+            "query": statement.base_name,
+            "sql": normalize_sql(statement.sql),
+            "params": shapes,
+            "total_ms": round(total * 1000, 3),
+            "phases_ms": {name: round(duration * 1000, 3) for name, duration in phases.items()},
+            "rows": rows,
+            "trace_id": trace.trace_id if trace is not None else None,
+        }
+        self.entries.append(entry)
+        logger.warning(f"🐢 Consulta lenta {entry['query']}: {entry['total_ms']:.0f} ms "
+                       f"{entry['phases_ms']} ({rows} linhas, trace={entry['trace_id']})")
+
+    def stats(self):
+        return {
+            "threshold": self.threshold,
+            "sample_rate": self.sample_rate,
+            "slow": self.slow,
+            "logged": self.logged,
+            "entries": list(self.entries),
+        }
+
+
+slow_query_log = SlowQueryLog(Config.SLOW_QUERY_THRESHOLD, Config.SLOW_QUERY_SAMPLE_RATE, Config.SLOW_QUERY_LOG_SIZE)
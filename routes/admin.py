@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from security.auth import get_current_admin, revoke_token
+from security.credential_cache import credential_cache
+from security.token_cache import token_cache
+from logger.setup_logger import setup_logger, get_logger
+from models.cache import query_cache
+from connection.oracle_conn import oracle_db
+from models.emitentes import emitente_map
+from models.snapshot import price_snapshots
+from models.search import promo_index
+from models.day_cache import sales_day_cache
+from monitoring.tracing import find_trace, recent_traces, slow_query_log
+
+# Configura o logger
+setup_logger()
+logger = get_logger(__name__)
+
+admin_router = APIRouter()
+
+SNAPSHOT_STORES = {"price_table": price_snapshots, "promos": promo_index}
+
+
+class TokenRevokeRequest(BaseModel):
+    token: str
+
+@admin_router.get("/cache")
+async def cache_stats(user: dict = Depends(get_current_admin)):
+    return {
+        "user": user["username"],
+        "data": {
+            **query_cache.stats(),
+            "day_buckets": sales_day_cache.stats(),
+            "single_flight": oracle_db.single_flight.stats() if oracle_db.single_flight else None,
+        }
+    }
+
+@admin_router.get("/snapshots")
+async def snapshot_stats(user: dict = Depends(get_current_admin)):
+    return {
+        "user": user["username"],
+        "data": {
+            **{name: store.stats() for name, store in SNAPSHOT_STORES.items()},
+            "emitentes": emitente_map.stats(),
+        }
+    }
+
+@admin_router.post("/snapshots/{codfilial}/refresh")
+async def snapshot_refresh(codfilial: int, store: str = "price_table", user: dict = Depends(get_current_admin)):
+    if store not in SNAPSHOT_STORES:
+        raise HTTPException(status_code=400, detail=f"Snapshot inválido: {store}")
+    snapshots = SNAPSHOT_STORES[store]
+    if codfilial not in snapshots.filiais:
+        raise HTTPException(status_code=404, detail="Filial não configurada para este snapshot")
+    refreshed = await snapshots.refresh(codfilial)
+    logger.info(f"🔄 {snapshots.name} da filial {codfilial} recarregado por {user['username']}: {refreshed}.")
+    return {
+        "user": user["username"],
+        "data": {"refreshed": refreshed}
+    }
+
+@admin_router.delete("/cache")
+async def cache_invalidate(query: str | None = None, key: str | None = None, user: dict = Depends(get_current_admin)):
+    removed = query_cache.invalidate(query, key) + sales_day_cache.invalidate(query, key)
+    logger.info(f"🧹 Cache invalidado por {user['username']} (query={query}, key={key}): {removed} entradas.")
+    return {
+        "user": user["username"],
+        "data": {"removed": removed}
+    }
+
+@admin_router.get("/tokens")
+async def token_stats(user: dict = Depends(get_current_admin)):
+    return {
+        "user": user["username"],
+        "data": {**token_cache.stats(), "credentials": credential_cache.stats()}
+    }
+
+@admin_router.post("/tokens/revoke")
+async def token_revoke(request: TokenRevokeRequest, user: dict = Depends(get_current_admin)):
+    revoked = revoke_token(request.token)
+    logger.info(f"🔒 Token revogado por {user['username']}: {revoked}.")
+    return {
+        "user": user["username"],
+        "data": {"revoked": revoked}
+    }
+
+@admin_router.delete("/tokens")
+async def token_invalidate(username: str | None = None, user: dict = Depends(get_current_admin)):
+    removed = token_cache.invalidate(username)
+    logger.info(f"🧹 Cache de tokens invalidado por {user['username']} (username={username}): {removed} entradas.")
+    return {
+        "user": user["username"],
+        "data": {"removed": removed}
+    }
+
+@admin_router.get("/traces")
+async def trace_list(user: dict = Depends(get_current_admin)):
+    return {
+        "user": user["username"],
+        "data": [
+            {"trace_id": trace.trace_id, "name": trace.name, "status": trace.status,
+             "duration_ms": None if trace.duration is None else round(trace.duration * 1000, 3)}
+            for trace in reversed(recent_traces)
+        ]
+    }
+
+@admin_router.get("/traces/{trace_id}")
+async def trace_detail(trace_id: str, user: dict = Depends(get_current_admin)):
+    trace = find_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace não encontrado")
+    return {
+        "user": user["username"],
+        "data": trace.as_dict()
+    }
+
+@admin_router.get("/slow_queries")
+async def slow_queries(user: dict = Depends(get_current_admin)):
+    return {
+        "user": user["username"],
+        "data": slow_query_log.stats()
+    }
@@ -0,0 +1,187 @@
+from datetime import date, datetime
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+import csv
+import io
+
+"""Formatos colunares (Arrow IPC, Parquet e CSV) para as rotas de grande volume. Os lotes
+chegam do banco já em colunas (OracleConnection.execute_query_columns_iter) e são gravados
+na resposta à medida que são lidos, sem montar a lista de dicts do JSON."""
+
+# Formato -> (media type, extensão do arquivo)
+COLUMNAR_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+# Media types aceitos no header Accept
+ACCEPT_FORMATS = {
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "text/csv": "csv",
+}
+
+# Formatos JSON: o padrão (lista de objetos) e o compacto (colunas + linhas)
+JSON_FORMATS = ("json", "compact")
+
+# Formatos que dependem do pyarrow (dependência opcional)
+ARROW_FORMATS = ("arrow", "parquet")
+
+
+def negotiate_format(format=None, accept=None, stream=None, page=None):
+    """Escolhe o formato da resposta: ?format= tem prioridade sobre o header Accept.
+
+    Retorna o formato pedido ("compact" ou um formato colunar) ou None para manter a
+    resposta JSON padrão.
+    """
+    if format is not None:
+        if format == "json":
+            return None
+        if format not in COLUMNAR_FORMATS and format not in JSON_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Formato inválido: {format}")
+        chosen = format
+    else:
+        media_types = [media.split(";")[0].strip().lower() for media in (accept or "").split(",")]
+        chosen = next((ACCEPT_FORMATS[media] for media in media_types if media in ACCEPT_FORMATS), None)
+        if chosen is None:
+            return None
+
+    if stream or page:
+        raise HTTPException(status_code=400, detail=f"Formato {chosen} não aceita stream nem paginação")
+    if chosen in ARROW_FORMATS:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=406, detail=f"Formato {chosen} indisponível: pyarrow não instalado")
+    return chosen
+
+
+class _ChunkSink(io.RawIOBase):
+    """Arquivo em memória que acumula o que os writers do pyarrow gravam até ser drenado"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_types(pa):
+    return {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        # NUMBER sem precisão pode trazer int e float na mesma coluna
+        "number": pa.float64(),
+        "decimal": pa.decimal128(38, 9),
+        "datetime": pa.timestamp("us"),
+        "string": pa.string(),
+    }
+
+
+def _arrow_batch(pa, schema, kinds, columns):
+    arrays = []
+    for field, kind, values in zip(schema, kinds, columns):
+        if kind == "decimal":
+            # Decimais com mais de 9 casas são truncados para caber no schema fixo
+            arrays.append(pa.array(values).cast(field.type, safe=False))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def _arrow_body(first, batches, format):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names, kinds, columns = first
+    types = _arrow_types(pa)
+    schema = pa.schema([pa.field(name, types[kind]) for name, kind in zip(names, kinds)])
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+        write = lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+
+    if columns and len(columns[0]):
+        write(_arrow_batch(pa, schema, kinds, columns))
+    yield sink.drain()
+    async for _, _, columns in batches:
+        write(_arrow_batch(pa, schema, kinds, columns))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def _csv_body(first, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain(columns):
+        writer.writerows([[_csv_value(value) for value in row] for row in zip(*columns)])
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    names, _, columns = first
+    writer.writerow(names)
+    yield drain(columns)
+    async for _, _, columns in batches:
+        yield drain(columns)
+
+
+async def columnar_response(batches, format, filename):
+    """Monta um StreamingResponse no `format` pedido a partir dos lotes colunares.
+
+    Como no NDJSON, o primeiro lote é buscado antes de iniciar a resposta, para que erros de
+    consulta ainda virem um status HTTP. Uma consulta sem linhas gera um arquivo só com o
+    schema (ou o cabeçalho, no CSV).
+    """
+    first = await anext(batches, None)
+    if first is None:
+        await batches.aclose()
+        raise RuntimeError("Consulta sem metadados de colunas")
+
+    async def body():
+        try:
+            if format == "csv":
+                async for chunk in _csv_body(first, batches):
+                    yield chunk
+            else:
+                async for chunk in _arrow_body(first, batches, format):
+                    if chunk:
+                        yield chunk
+        finally:
+            await batches.aclose()
+
+    media_type, extension = COLUMNAR_FORMATS[format]
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
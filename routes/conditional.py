@@ -0,0 +1,113 @@
+from environment.config import Config
+from fastapi import Response
+from models.cache import query_cache
+from monitoring import tracing
+from routes.responses import dumps
+import asyncio
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+"""Respostas condicionais (ETag / 304) e comprimidas (gzip, brotli) para os dados de
+referência cacheados. O corpo serializado, o ETag e as versões comprimidas ficam junto da
+entrada do cache de consultas, então um poll sem mudança responde 304 sem serializar nada."""
+
+
+class RenderedBody:
+    """Corpo JSON serializado, seu ETag (hash do conteúdo) e as versões comprimidas"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self._encoded = {}
+
+    @property
+    def nbytes(self):
+        """Bytes do corpo e das versões comprimidas (contados no limite do cache)"""
+        return len(self.body) + len(self.etag) + sum(len(data) for data in self._encoded.values())
+
+    async def encoded(self, encoding):
+        """Corpo na codificação pedida (None = sem compressão), comprimido uma única vez"""
+        if encoding is None:
+            return self.body
+        data = self._encoded.get(encoding)
+        if data is None:
+            with tracing.span("compress", encoding=encoding):
+                data = await asyncio.to_thread(compress, self.body, encoding)
+            self._encoded[encoding] = data
+        return data
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=Config.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.COMPRESSION_GZIP_LEVEL)
+
+
+def choose_encoding(accept_encoding):
+    """Escolhe br ou gzip a partir do header Accept-Encoding (respeitando q=0)"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def etag_matches(if_none_match, etag):
+    """Comparação fraca do If-None-Match (lista de ETags ou *)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
+def _render(user, result, compact, extra):
+    if compact:
+        columns, rows = result
+        return dumps({"user": user["username"], "columns": columns, "rows": rows, **extra})
+    return dumps({"user": user["username"], "data": result, **extra})
+
+
+async def conditional_response(request, user, result, compact=False, **extra):
+    """Resposta JSON com ETag, 304 para If-None-Match igual e compressão acima de
+    COMPRESSION_MIN_SIZE. `result` é o valor devolvido pelo Model (de preferência cacheado);
+    `extra` são campos adicionais do envelope, como em data_response."""
+    memo = query_cache.derived(result)
+    key = ("rendered", user["username"], compact, tuple(sorted(extra.items())))
+    rendered = memo.get(key) if memo is not None else None
+    if rendered is None:
+        with tracing.span("serialize"):
+            rendered = RenderedBody(_render(user, result, compact, extra))
+        if memo is not None:
+            memo[key] = rendered
+
+    headers = {"ETag": rendered.etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = None
+    if len(rendered.body) >= Config.COMPRESSION_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    size = rendered.nbytes
+    body = await rendered.encoded(encoding)
+    if memo is not None and rendered.nbytes != size:
+        # Nova versão comprimida: recontabiliza o tamanho da entrada no cache
+        memo[key] = rendered
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from connection.oracle_conn import oracle_db
+from models.model import Model
+from models.warmup import WarmUp
+from routes.responses import FastJSONResponse
+from security.auth import warm_up_auth
+
+health_router = APIRouter()
+
+
+async def _auth_step():
+    await warm_up_auth()
+    return True
+
+
+# Etapas do warm-up, em ordem: hash das senhas, backend + pool em paralelo, consulta teste
+warm_up = WarmUp([
+    ("auth", _auth_step),
+    ("database", oracle_db.warm_up),
+    ("try_connection", Model.try_connection),
+])
+
+
+@health_router.get("/live")
+async def live():
+    """O processo está de pé e o event loop responde (não depende do banco)"""
+    return {"status": "live"}
+
+
+@health_router.get("/ready")
+async def ready():
+    """200 só depois do warm-up completo; antes disso (ou se falhou) 503"""
+    if warm_up.check():
+        return {"status": "ready", "data": warm_up.stats()}
+    return FastJSONResponse(status_code=503, content={"status": "starting", "data": warm_up.stats()})
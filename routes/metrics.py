@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from environment.config import Config
+from monitoring.metrics import registry
+
+metrics_router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@metrics_router.get("/metrics")
+async def metrics():
+    """Métricas no formato texto do Prometheus (sem autenticação, como /health)"""
+    if not Config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desabilitadas")
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,73 @@
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from monitoring import tracing
+import orjson
+
+STREAM_FORMATS = ("ndjson",)
+
+
+def json_default(value):
+    """Serializa os tipos devolvidos pelo banco que o orjson não conhece (Decimal)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps(content):
+    """JSON em bytes com orjson. Chaves int são aceitas (ex.: {codcli: [...]} dos lotes)"""
+    return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson (datetime nativo, Decimal como float)"""
+
+    def render(self, content):
+        with tracing.span("serialize"):
+            return dumps(content)
+
+
+def data_response(user, data, **extra):
+    """Envelope padrão {"user", "data", ...}. Retornar a resposta pronta evita o
+    jsonable_encoder que o FastAPI aplica, linha a linha, sobre dicts retornados."""
+    return FastJSONResponse({"user": user["username"], "data": data, **extra})
+
+
+def compact_response(user, result):
+    """Envelope compacto {"user", "columns", "rows"}: nomes das colunas uma única vez e
+    cada linha como lista de valores. `result` é o (colunas, linhas) de execute_query_rows."""
+    columns, rows = result
+    return FastJSONResponse({"user": user["username"], "columns": columns, "rows": rows})
+
+
+def check_stream_format(stream):
+    """Valida o parâmetro ?stream= das rotas"""
+    if stream is not None and stream not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato de stream inválido: {stream}")
+
+
+def _ndjson_chunk(batch):
+    return b"".join(dumps(row) + b"\n" for row in batch)
+
+
+async def ndjson_response(batches):
+    """Monta um StreamingResponse NDJSON (uma linha JSON por registro) a partir dos lotes.
+
+    O primeiro lote é buscado antes de iniciar a resposta, para que erros de consulta
+    ainda possam virar um status HTTP em vez de uma resposta truncada.
+    """
+    first = await anext(batches, None)
+
+    async def body():
+        try:
+            if first:
+                yield _ndjson_chunk(first)
+            async for batch in batches:
+                yield _ndjson_chunk(batch)
+        finally:
+            await batches.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -1,8 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from pydantic import BaseModel
 from security.auth import get_current_user
 from fastapi.responses import JSONResponse
 from logger.setup_logger import setup_logger, get_logger
 from models.model import Model
+from models.pagination import InvalidCursorError, decode_cursor
+from models.batching import unique_codes
+from models.ranges import range_budget
+from connection.oracle_conn import track_query_errors
+from routes.responses import check_stream_format, compact_response, data_response, ndjson_response
+from routes.columnar import columnar_response, negotiate_format
+from routes.conditional import conditional_response
+from environment.config import Config
+import asyncio
 
 # Configura o logger
 setup_logger()
@@ -10,156 +20,387 @@ logger = get_logger(__name__)
 
 client_router = APIRouter()
 
+
+# Parâmetros que são códigos do Winthor (inteiros positivos), validados por _check_codes
+CODE_PARAMS = ("codcli", "codfilial", "codusur", "codsuperv", "numnota")
+
+
+def _check_codes(*codes):
+    """400 se algum código não for positivo, antes de ir ao banco"""
+    if any(code <= 0 for code in codes):
+        raise HTTPException(status_code=400, detail="Código inválido")
+
+
+def _page_args(limit, cursor):
+    """Valida limit/cursor da paginação keyset. Retorna None quando a rota não é paginada"""
+    if limit is None and cursor is None:
+        return None
+    limit = limit or Config.PAGE_DEFAULT_LIMIT
+    if limit <= 0 or limit > Config.PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit deve estar entre 1 e {Config.PAGE_MAX_LIMIT}")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return limit, after
+
+
+class CodesRequest(BaseModel):
+    codes: list[int]
+
+
+def _parse_codes(codes_csv=None, body=None):
+    """Lê a lista de códigos do parâmetro CSV (?codcli=1,2,3) ou do corpo JSON"""
+    try:
+        if body is not None:
+            codes = body.codes
+        else:
+            codes = [int(code) for code in (codes_csv or "").split(",") if code.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Lista de códigos inválida")
+    codes = unique_codes(codes)
+    if not codes or any(code <= 0 for code in codes):
+        raise HTTPException(status_code=400, detail="Código inválido")
+    if len(codes) > Config.BATCH_MAX_CODES:
+        raise HTTPException(status_code=400, detail=f"Máximo de {Config.BATCH_MAX_CODES} códigos por requisição")
+    return codes
+
+
+async def _batch_lookup(lookup, codes, user, route):
+    try:
+        result = await lookup(codes)
+    except Exception as e:
+        logger.error(f"❌ Erro na rota {route}: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno no servidor")
+    if result is None:
+        raise HTTPException(status_code=500, detail="Erro interno no servidor")
+    found, missing = result
+    return data_response(user, found, missing=missing)
+
+
 @client_router.get("/client")
 async def get_info_client(codcli: int, user: dict = Depends(get_current_user)):
-    if codcli <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(codcli)
     try:
-        result = Model.query_info_client(codcli)
+        result = await Model.query_info_client(codcli)
         if not result:
             raise HTTPException(status_code=404, detail="Cliente não encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /client para codcli={codcli}: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
     
+@client_router.get("/clients")
+async def get_info_clients(codcli: str, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.query_info_clients, _parse_codes(codcli), user, "/clients")
+
+@client_router.post("/clients")
+async def post_info_clients(body: CodesRequest, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.query_info_clients, _parse_codes(body=body), user, "/clients")
+
 @client_router.get("/aswer_table")
-async def answer_table(codfilial: int, user: dict = Depends(get_current_user)):
-    if codfilial <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+async def answer_table(request: Request, codfilial: int, stream: str | None = None, limit: int | None = None, cursor: str | None = None, format: str | None = None, accept: str | None = Header(None), user: dict = Depends(get_current_user)):
+    _check_codes(codfilial)
+    check_stream_format(stream)
+    page = _page_args(limit, cursor)
+    columnar = negotiate_format(format, accept, stream, page)
     try:
-        result = Model.answer_table(codfilial)
+        if columnar == "compact":
+            result = await Model.answer_table_compact(codfilial)
+            if not result or not result[1]:
+                raise HTTPException(status_code=404, detail="Tabela não atualizada")
+            return await conditional_response(request, user, result, compact=True)
+        if columnar:
+            return await columnar_response(Model.answer_table_columns(codfilial), columnar, f"aswer_table_{codfilial}")
+        if stream:
+            return await ndjson_response(Model.answer_table_stream(codfilial))
+        if page:
+            result, next_cursor = await Model.answer_table_page(codfilial, *page)
+            if not result:
+                raise HTTPException(status_code=404, detail="Tabela não atualizada")
+            return data_response(user, result, next_cursor=next_cursor)
+        result = await Model.answer_table(codfilial)
         if not result:
             raise HTTPException(status_code=404, detail="Tabela não atualizada")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return await conditional_response(request, user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /answer_table na filial {codfilial}: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
+def _price_snapshot(codfilial):
+    _check_codes(codfilial)
+    snapshot = Model.answer_table_snapshot(codfilial)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Tabela de preços da filial não carregada em memória")
+    return snapshot
+
+
+class EansRequest(BaseModel):
+    eans: list[str]
+
+
+def _parse_eans(eans_csv=None, body=None):
+    """Lê a lista de EANs (texto, preservando zeros à esquerda) do CSV ou do corpo JSON"""
+    eans = body.eans if body is not None else (eans_csv or "").split(",")
+    eans = unique_codes([ean.strip() for ean in eans if ean.strip()])
+    if not eans:
+        raise HTTPException(status_code=400, detail="EAN inválido")
+    if len(eans) > Config.BATCH_MAX_CODES:
+        raise HTTPException(status_code=400, detail=f"Máximo de {Config.BATCH_MAX_CODES} EANs por requisição")
+    return eans
+
+@client_router.get("/aswer_table/product")
+async def answer_table_product(codfilial: int, ean: str | None = None, codprod: int | None = None, principativo: str | None = None, user: dict = Depends(get_current_user)):
+    if [ean, codprod, principativo].count(None) != 2:
+        raise HTTPException(status_code=400, detail="Informe apenas um entre ean, codprod e principativo")
+    snapshot = _price_snapshot(codfilial)
+    if ean is not None:
+        result = snapshot.find_ean(ean)
+    elif codprod is not None:
+        result = snapshot.find_codprod(codprod)
+    else:
+        result = snapshot.find_principativo(principativo)
+    if not result:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    return data_response(user, result, snapshot_at=snapshot.loaded_at)
+
+@client_router.get("/aswer_table/eans")
+async def get_answer_table_eans(codfilial: int, ean: str, user: dict = Depends(get_current_user)):
+    snapshot = _price_snapshot(codfilial)
+    found, missing = snapshot.find_eans(_parse_eans(ean))
+    return data_response(user, found, missing=missing, snapshot_at=snapshot.loaded_at)
+
+@client_router.post("/aswer_table/eans")
+async def post_answer_table_eans(codfilial: int, body: EansRequest, user: dict = Depends(get_current_user)):
+    snapshot = _price_snapshot(codfilial)
+    found, missing = snapshot.find_eans(_parse_eans(body=body))
+    return data_response(user, found, missing=missing, snapshot_at=snapshot.loaded_at)
+
 @client_router.get("/sales_by_rca_between_dates")
 async def sales_by_rca_between_dates(codusur: int, data1: str, data2: str, user: dict = Depends(get_current_user)):
-    if codusur <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(codusur)
     try:
-        result = Model.sales_by_rca_between_dates(codusur, data1, data2)
+        result = await Model.sales_by_rca_between_dates(codusur, data1, data2)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /sales_by_rca_between_dates: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
 @client_router.get("/sales_by_rca")
 async def sales_by_rca(codusur: int, data1: str, user: dict = Depends(get_current_user)):
-    if codusur <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(codusur)
     try:
-        result = Model.sales_by_rca(codusur, data1)
+        result = await Model.sales_by_rca(codusur, data1)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /sales_by_rca: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
     
 @client_router.get("/sales_by_superv_between_dates")
-async def sales_by_superv_between_dates(codsuperv: int, data1: str, data2: str, user: dict = Depends(get_current_user)):
-    if codsuperv <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+async def sales_by_superv_between_dates(codsuperv: int, data1: str, data2: str, stream: str | None = None, limit: int | None = None, cursor: str | None = None, format: str | None = None, accept: str | None = Header(None), user: dict = Depends(get_current_user)):
+    _check_codes(codsuperv)
+    check_stream_format(stream)
+    page = _page_args(limit, cursor)
+    columnar = negotiate_format(format, accept, stream, page)
     try:
-        result = Model.sales_by_superv_between_dates(codsuperv, data1, data2)
+        if columnar == "compact":
+            result = await Model.sales_by_superv_between_dates_compact(codsuperv, data1, data2)
+            if not result or not result[1]:
+                raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
+            return compact_response(user, result)
+        if columnar:
+            return await columnar_response(
+                Model.sales_by_superv_between_dates_columns(codsuperv, data1, data2), columnar,
+                f"sales_by_superv_{codsuperv}")
+        if stream:
+            return await ndjson_response(Model.sales_by_superv_between_dates_stream(codsuperv, data1, data2))
+        if page:
+            result, next_cursor = await Model.sales_by_superv_between_dates_page(codsuperv, data1, data2, *page)
+            if not result:
+                raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
+            return data_response(user, result, next_cursor=next_cursor)
+        result = await Model.sales_by_superv_between_dates(codsuperv, data1, data2)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /sales_by_superv_between_dates: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
 @client_router.get("/sales_by_superv")
 async def sales_by_superv(codsuperv: int, data1: str, user: dict = Depends(get_current_user)):
-    if codsuperv <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(codsuperv)
     try:
-        result = Model.sales_by_superv(codsuperv, data1)
+        result = await Model.sales_by_superv(codsuperv, data1)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /sales_by_superv: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
     
 @client_router.get("/promos")
-async def promos(codfilial: int, condicoes: str, user: dict = Depends(get_current_user)):
-    if codfilial <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+async def promos(request: Request, codfilial: int, condicoes: str, stream: str | None = None, limit: int | None = None, cursor: str | None = None, top: int | None = None, user: dict = Depends(get_current_user)):
+    _check_codes(codfilial)
+    if top is not None and (top <= 0 or top > Config.PAGE_MAX_LIMIT):
+        raise HTTPException(status_code=400, detail=f"top deve estar entre 1 e {Config.PAGE_MAX_LIMIT}")
+    check_stream_format(stream)
+    page = _page_args(limit, cursor)
+    index = Model.promos_index(codfilial)
+    if index is not None and not stream and not page:
+        # Busca em memória: termos como substrings, ordenada por relevância
+        result = index.search(condicoes, top)
+        if not result:
+            raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
+        return await conditional_response(request, user, result, snapshot_at=index.loaded_at)
     try:
-        result = Model.promos(codfilial, condicoes)
+        if stream:
+            return await ndjson_response(Model.promos_stream(codfilial, condicoes))
+        if page:
+            result, next_cursor = await Model.promos_page(codfilial, condicoes, *page)
+            if not result:
+                raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
+            return data_response(user, result, next_cursor=next_cursor)
+        result = await Model.promos(codfilial, condicoes)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        if top is not None:
+            return data_response(user, result[:top])
+        return await conditional_response(request, user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /promos: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
 @client_router.get("/nf_xml_data")
 async def nf_xml_data(numnota: int, user: dict = Depends(get_current_user)):
-    if numnota <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(numnota)
     try:
-        result = Model.nf_xml_data(numnota)
+        result = await Model.nf_xml_data(numnota)
         if not result:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado")
-        return {
-            "user": user["username"],
-            "data": result
-        }
+        return data_response(user, result)
     except Exception as e:
         logger.error(f"❌ Erro na rota /nf_xml_data: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
+@client_router.get("/nf_xml_data/batch")
+async def get_nf_xml_data_batch(numnota: str, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.nf_xml_data_batch, _parse_codes(numnota), user, "/nf_xml_data/batch")
+
+@client_router.post("/nf_xml_data/batch")
+async def post_nf_xml_data_batch(body: CodesRequest, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.nf_xml_data_batch, _parse_codes(body=body), user, "/nf_xml_data/batch")
+
 @client_router.get("/boleto_data")
 async def boleto_data(numnota: int, user: dict = Depends(get_current_user)):
-    if numnota <= 0:
-        raise HTTPException(status_code=400, detail="Código inválido")
+    _check_codes(numnota)
     try:
-        result = Model.boleto_data(numnota)
-        return {
-            "user": user["username"],
-            "data": result or []
-        }
+        result = await Model.boleto_data(numnota)
+        return data_response(user, result or [])
     except Exception as e:
         logger.error(f"❌ Erro na rota /boleto_data: {e}")
         raise HTTPException(status_code=500, detail="Erro interno no servidor")
 
+@client_router.get("/boleto_data/batch")
+async def get_boleto_data_batch(numnota: str, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.boleto_data_batch, _parse_codes(numnota), user, "/boleto_data/batch")
+
+@client_router.post("/boleto_data/batch")
+async def post_boleto_data_batch(body: CodesRequest, user: dict = Depends(get_current_user)):
+    return await _batch_lookup(Model.boleto_data_batch, _parse_codes(body=body), user, "/boleto_data/batch")
+
 @client_router.get("/sales_by_rca_fornec")
-async def sales_by_rca_fornec(codfornec: int, codemitente: int, data1: str, data2: str, user: dict = Depends(get_current_user)):
+async def sales_by_rca_fornec(codfornec: int, codemitente: int, data1: str, data2: str, format: str | None = None, accept: str | None = Header(None), user: dict = Depends(get_current_user)):
+    columnar = negotiate_format(format, accept)
     try:
-        result = Model.sales_by_rca_fornec(codfornec, codemitente, data1, data2)
-        return {
-            "user": user["username"],
-            "data": result or []
-        }
+        if columnar == "compact":
+            result = await Model.sales_by_rca_fornec_compact(codfornec, codemitente, data1, data2)
+            if result is None:
+                raise HTTPException(status_code=500, detail="Erro interno no servidor")
+            return compact_response(user, result)
+        if columnar:
+            return await columnar_response(
+                Model.sales_by_rca_fornec_columns(codfornec, codemitente, data1, data2), columnar,
+                f"sales_by_rca_fornec_{codfornec}_{codemitente}")
+        result = await Model.sales_by_rca_fornec(codfornec, codemitente, data1, data2)
+        return data_response(user, result or [])
     except Exception as e:
         logger.error(f"❌ Erro na rota /sales_by_rca_fornec: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno no servidor")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno no servidor")
+
+
+class BatchItem(BaseModel):
+    id: str | None = None
+    method: str
+    params: dict = {}
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchItem]
+
+
+# Métodos disponíveis no /batch: nome -> (método do Model, parâmetros na ordem da chamada,
+# se resultado vazio é 404). Os nomes dos parâmetros são os mesmos das rotas individuais.
+BATCH_METHODS = {
+    "client": (Model.query_info_client, {"codcli": int}, True),
+    "aswer_table": (Model.answer_table, {"codfilial": int}, True),
+    "sales_by_rca_between_dates": (Model.sales_by_rca_between_dates, {"codusur": int, "data1": str, "data2": str}, True),
+    "sales_by_rca": (Model.sales_by_rca, {"codusur": int, "data1": str}, True),
+    "sales_by_superv_between_dates": (Model.sales_by_superv_between_dates, {"codsuperv": int, "data1": str, "data2": str}, True),
+    "sales_by_superv": (Model.sales_by_superv, {"codsuperv": int, "data1": str}, True),
+    "promos": (Model.promos, {"codfilial": int, "condicoes": str}, True),
+    "nf_xml_data": (Model.nf_xml_data, {"numnota": int}, True),
+    "boleto_data": (Model.boleto_data, {"numnota": int}, False),
+    "sales_by_rca_fornec": (Model.sales_by_rca_fornec, {"codfornec": int, "codemitente": int, "data1": str, "data2": str}, False),
+}
+
+
+async def _run_batch_item(item, semaphore):
+    response = {"id": item.id, "method": item.method}
+    if item.method not in BATCH_METHODS:
+        return {**response, "status": 400, "detail": "Método desconhecido"}
+
+    method, spec, empty_is_404 = BATCH_METHODS[item.method]
+    try:
+        args = [cast(item.params[name]) for name, cast in spec.items()]
+    except (KeyError, TypeError, ValueError):
+        return {**response, "status": 400, "detail": f"Parâmetros obrigatórios: {', '.join(spec)}"}
+    try:
+        # Mesma validação das rotas individuais
+        _check_codes(*(arg for name, arg in zip(spec, args) if name in CODE_PARAMS))
+    except HTTPException as e:
+        return {**response, "status": e.status_code, "detail": e.detail}
+
+    try:
+        async with semaphore:
+            with track_query_errors() as errors:
+                result = await method(*args)
+    except Exception as e:
+        logger.error(f"❌ Erro no item {item.method} da rota /batch: {e}")
+        return {**response, "status": 500, "detail": "Erro interno no servidor"}
+    if errors:
+        # O Model devolve None também quando a consulta falha: não é "sem dados"
+        logger.error(f"❌ Erro no item {item.method} da rota /batch: {errors.count} consultas falharam")
+        return {**response, "status": 500, "detail": "Erro interno no servidor"}
+
+    if not result and empty_is_404:
+        return {**response, "status": 404, "detail": "Nenhum dado encontrado"}
+    return {**response, "status": 200, "data": result or []}
+
+@client_router.post("/batch")
+async def batch(body: BatchRequest, user: dict = Depends(get_current_user)):
+    if not body.requests:
+        raise HTTPException(status_code=400, detail="Nenhuma consulta informada")
+    if len(body.requests) > Config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {Config.BATCH_MAX_ITEMS} consultas por lote")
+
+    # Cada item usa sua própria conexão do pool; o semáforo limita quantas por lote
+    semaphore = asyncio.Semaphore(Config.BATCH_CONCURRENCY)
+    # e as sub-consultas de período de todos os itens dividem um único budget
+    with range_budget(Config.RANGE_SPLIT_MAX_PARTS):
+        results = await asyncio.gather(*(_run_batch_item(item, semaphore) for item in body.requests))
+    return data_response(user, results)
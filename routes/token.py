@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from security.auth import authenticate_user, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from security.auth import authenticate_user_async, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta
 
 token_router = APIRouter()
 
 @token_router.post("/token")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user_async(form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Usuário ou senha inválidos")
     
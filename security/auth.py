@@ -1,9 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from environment.config import ConfigAuth
+from environment.config import Config, ConfigAuth
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from security.credential_cache import credential_cache
+from security.token_cache import token_cache
+import asyncio
+import threading
 
 
 # Configurações
@@ -16,16 +21,32 @@ USER_1_FULLNAME = ConfigAuth.USER_1_FULLNAME
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# bcrypt é CPU puro: roda fora do event loop, em no máximo AUTH_BCRYPT_WORKERS threads
+password_executor = ThreadPoolExecutor(max_workers=Config.AUTH_BCRYPT_WORKERS, thread_name_prefix="bcrypt")
 
-password_jose = pwd_context.hash(USER_1_PASSWORD)
+# O hash bcrypt das senhas é gerado em hash_passwords() (warm-up ou primeiro login), não no import
 users_db = {
     "joselucas": {
         "username": USER_1_USERNAME,
         "full_name": USER_1_FULLNAME,
-        "hashed_password": password_jose,
+        "hashed_password": None,
         "role": "admin",
     }
 }
+_plain_passwords = {"joselucas": USER_1_PASSWORD}
+_hash_lock = threading.Lock()
+
+def hash_passwords():
+    """Gera o hash das senhas cadastradas que ainda não têm (bloqueante, uma vez por processo)"""
+    with _hash_lock:
+        for username, password in list(_plain_passwords.items()):
+            users_db[username]["hashed_password"] = pwd_context.hash(password)
+            del _plain_passwords[username]
+
+async def warm_up_auth():
+    """hash_passwords() no password_executor, fora do event loop"""
+    if _plain_passwords:
+        await asyncio.get_running_loop().run_in_executor(password_executor, hash_passwords)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -35,30 +56,77 @@ def get_user(db, username: str):
 
 def authenticate_user(username: str, password: str):
     user = get_user(users_db, username)
+    if _plain_passwords:
+        hash_passwords()
     if not user or not verify_password(password, user["hashed_password"]):
         return False
     return user
 
+async def authenticate_user_async(username: str, password: str):
+    """Versão assíncrona de authenticate_user: credenciais conferidas há pouco são aceitas
+    sem bcrypt; as demais são verificadas no password_executor"""
+    user = get_user(users_db, username)
+    if not user:
+        return False
+    await warm_up_auth()
+    hashed_password = user["hashed_password"]
+    if credential_cache.ttl > 0 and credential_cache.check(username, password, hashed_password):
+        return user
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(password_executor, verify_password, password, hashed_password):
+        return False
+    if credential_cache.ttl > 0:
+        credential_cache.add(username, password, hashed_password)
+    return user
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token inválido ou expirado",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    # Token já verificado e ainda dentro do exp: dispensa jwt.decode e a busca do usuário
+    if Config.TOKEN_CACHE_ENABLED:
+        user = token_cache.get(token)
+        if user is not None:
+            return user
+    if token_cache.is_revoked(token):
+        raise _credentials_exception()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
         user = get_user(users_db, username)
         if user is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        if Config.TOKEN_CACHE_ENABLED:
+            token_cache.set(token, user, payload.get("exp"))
         return user
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise _credentials_exception()
+
+def revoke_token(token: str):
+    """Recusa o token até o exp dele. Retorna False se o token já é inválido ou expirou."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    token_cache.revoke(token, payload.get("exp"))
+    return True
+
+async def get_current_admin(user: dict = Depends(get_current_user)):
+    if user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a administradores",
+        )
+    return user
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from environment.config import Config
+import hashlib
+import hmac
+import secrets
+import time
+
+"""Cache de credenciais já conferidas com sucesso no login. A chave é um HMAC-SHA256 de
+usuário, senha e hash cadastrado, com uma chave aleatória gerada a cada processo: a senha
+em texto nunca fica em memória e o digest não serve fora deste processo. Trocar a senha
+cadastrada muda o hash e, com ele, a chave."""
+
+
+class CredentialCache:
+    """Digest das credenciais -> validade, com TTL curto e limite de entradas (LRU)"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._key = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _digest(self, username, password, hashed_password):
+        message = "\0".join((username, password, hashed_password)).encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def check(self, username, password, hashed_password):
+        """True se essas credenciais foram conferidas há menos de `ttl` segundos"""
+        digest = self._digest(username, password, hashed_password)
+        expires_at = self._entries.get(digest)
+        if expires_at is None or time.monotonic() >= expires_at:
+            if expires_at is not None:
+                del self._entries[digest]
+            self.misses += 1
+            return False
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return True
+
+    def add(self, username, password, hashed_password):
+        """Guarda credenciais conferidas pelo bcrypt (só as corretas)"""
+        digest = self._digest(username, password, hashed_password)
+        self._entries[digest] = time.monotonic() + self.ttl
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        removed = len(self._entries)
+        self._entries.clear()
+        return removed
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+credential_cache = CredentialCache(Config.AUTH_CREDENTIAL_CACHE_TTL, Config.AUTH_CREDENTIAL_CACHE_MAX_ENTRIES)
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from environment.config import Config
+import hashlib
+import time
+
+"""Cache dos tokens JWT já verificados. A chave é o digest do token (o token em si não fica
+em memória) e cada entrada vale até o `exp` do próprio token: enquanto estiver no cache,
+get_current_user devolve o usuário sem refazer a verificação da assinatura."""
+
+
+def token_digest(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class VerifiedTokenCache:
+    """Digest do token -> (usuário, exp), com limite de entradas (LRU) e lista de revogados"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # digest -> exp; tokens revogados são recusados até expirarem
+        self._revoked = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.revocations = 0
+        self.revoked_hits = 0
+
+    def get(self, token):
+        """Usuário do token já verificado, ou None (não está no cache ou expirou)"""
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        user, exp = entry
+        if time.time() >= exp:
+            del self._entries[digest]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return user
+
+    def set(self, token, user, exp):
+        """Guarda um token verificado até `exp` (timestamp Unix)"""
+        if exp is None or time.time() >= exp:
+            return
+        digest = token_digest(token)
+        self._entries[digest] = (user, exp)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def is_revoked(self, token):
+        if not self._revoked:
+            return False
+        digest = token_digest(token)
+        exp = self._revoked.get(digest)
+        if exp is None:
+            return False
+        if time.time() >= exp:
+            del self._revoked[digest]
+            return False
+        self.revoked_hits += 1
+        return True
+
+    def revoke(self, token, exp):
+        """Remove o token do cache e passa a recusá-lo até `exp`"""
+        digest = token_digest(token)
+        self._entries.pop(digest, None)
+        now = time.time()
+        self._revoked = {key: until for key, until in self._revoked.items() if until > now}
+        if exp is not None and exp > now:
+            self._revoked[digest] = exp
+        self.revocations += 1
+
+    def invalidate(self, username=None):
+        """Remove as entradas do usuário `username` (todas, sem argumento); os tokens
+        continuam válidos e voltam a ser verificados na próxima requisição"""
+        removed = 0
+        for digest, (user, _) in list(self._entries.items()):
+            if username is not None and user.get("username") != username:
+                continue
+            del self._entries[digest]
+            removed += 1
+        return removed
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "revoked": len(self._revoked),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "revocations": self.revocations,
+            "revoked_hits": self.revoked_hits,
+        }
+
+
+token_cache = VerifiedTokenCache(Config.TOKEN_CACHE_MAX_ENTRIES)
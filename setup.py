@@ -84,9 +84,10 @@ def test_connection():
     try:
         # Importar e testar conexão
         sys.path.append('.')
+        import asyncio
         from models.model import Model
 
-        result = Model.try_connection()
+        result = asyncio.run(Model.try_connection())
         if result:
             print("✅ Conexão com o banco OK")
             return True